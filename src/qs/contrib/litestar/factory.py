@@ -28,6 +28,7 @@ from litestar.config.response_cache import (
 from litestar.di import Provide
 from litestar.plugins import PluginProtocol
 from litestar.repository.exceptions import RepositoryError
+from litestar.stores.base import Store
 from litestar.stores.redis import RedisStore
 from litestar.stores.registry import StoreRegistry
 from litestar.types import ControllerRouterHandler, Middleware
@@ -100,6 +101,12 @@ class AppFactory[T: Struct]:
         }
         self._sqla_config = create_sqlalchemy_config(self._app_settings.sqlalchemy)
         self._redis = create_redis_client(self._app_settings.redis)
+        self._stores = StoreRegistry(
+            default_factory=lambda name: RedisStore(
+                self._redis,
+                namespace=f"{self._app_settings.api.app_name}:{name}",
+            ),
+        )
         self._plugins: list[PluginProtocol] = [
             SQLAlchemyPlugin(self._sqla_config),
         ]
@@ -178,6 +185,13 @@ class AppFactory[T: Struct]:
         return lambda: self._settings
 
 
+    def create_store_getter(self) -> t.Callable[[str], Store]:
+        """
+        Getter of the app's named stores, for use outside request handlers.
+        """
+        return self._stores.get
+
+
     def create_session_getter(self):
         return lambda: self._sqla_config.get_session()
 
@@ -209,12 +223,7 @@ class AppFactory[T: Struct]:
                 default_expiration=self._app_settings.api.cache_expiration,
                 key_builder=self.cache_key_builder,
             ),
-            stores=StoreRegistry(
-                default_factory=lambda name: RedisStore(
-                    self._redis,
-                    namespace=f"{self._app_settings.api.app_name}:{name}",
-                ),
-            ),
+            stores=self._stores,
             signature_namespace=self._signature_namespace,
             middleware=self._middleware,
         )
@@ -1,6 +1,22 @@
+from __future__ import annotations
+
+import typing as t
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime
 from importlib.resources import files
+
 import pandas as pd
 
+from qs.contrib.msgspec import Struct
+
+
+class EventResponse(Struct, frozen=True):
+    id: int
+    date: str
+    title: str
+    description: str
+
+
 def _load_events_df() -> pd.DataFrame:
     csv_path = files("qs") / "resources" / "financial_events_2005_2010.csv"
     df = pd.read_csv(csv_path)
@@ -9,15 +25,77 @@ def _load_events_df() -> pd.DataFrame:
 
 EVENTS_DF = _load_events_df()
 
-def get_event_by_id(event_id: int) -> dict | None:
-    try:
-        row = EVENTS_DF.loc[event_id]
-    except KeyError:
-        return None
-
-    return {
-        "id": int(event_id),
-        "date": row["Date"],
-        "title": row["Event Title"],
-        "description": row["Description"],
-    }
\ No newline at end of file
+
+class EventIndex:
+    """
+    Immutable date index over the historical events. Events are kept as
+    shared `EventResponse` instances sorted by date, so lookups by day are
+    a dict probe and range queries a binary search.
+    """
+    __slots__ = ("_events", "_ordinals", "_by_day", "_by_id")
+
+    def __init__(self, df: pd.DataFrame):
+        rows: list[tuple[int, EventResponse]] = []
+        for row in df.to_dict("records"):
+            day = datetime.strptime(row["Date"], "%m-%d-%Y").date()
+            event = EventResponse(
+                id=int(row["ID"]),
+                date=row["Date"],
+                title=row["Event Title"],
+                description=row["Description"],
+            )
+            rows.append((day.toordinal(), event))
+
+        rows.sort(key=lambda row: row[0])
+
+        self._events: tuple[EventResponse, ...] = tuple(
+            event for _, event in rows
+        )
+        self._ordinals: tuple[int, ...] = tuple(
+            ordinal for ordinal, _ in rows
+        )
+
+        by_day: dict[int, tuple[EventResponse, ...]] = {}
+        for ordinal, event in rows:
+            by_day[ordinal] = by_day.get(ordinal, ()) + (event,)
+
+        self._by_day = by_day
+        self._by_id = {event.id: event for event in self._events}
+
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+
+    def __iter__(self) -> t.Iterator[EventResponse]:
+        return iter(self._events)
+
+
+    def get_dates(self) -> frozenset[date]:
+        return frozenset(date.fromordinal(ordinal) for ordinal in self._by_day)
+
+
+    def get_by_id(self, event_id: int) -> EventResponse | None:
+        return self._by_id.get(event_id)
+
+
+    def on(self, day: date) -> tuple[EventResponse, ...]:
+        """
+        Events that happened on the given day.
+        """
+        return self._by_day.get(day.toordinal(), ())
+
+
+    def between(self, start: date, end: date) -> tuple[EventResponse, ...]:
+        """
+        Events that happened between `start` and `end`, both inclusive.
+        """
+        lo = bisect_left(self._ordinals, start.toordinal())
+        hi = bisect_right(self._ordinals, end.toordinal())
+        return self._events[lo:hi]
+
+
+EVENT_INDEX = EventIndex(EVENTS_DF)
+
+def get_event_by_id(event_id: int) -> EventResponse | None:
+    return EVENT_INDEX.get_by_id(event_id)
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import typing as t
+from datetime import date, datetime
+
+import numpy as np
+
+from qs.cache import lru_cache
+from qs.contrib.msgspec import Struct, msgspec
+from qs.exceptions import BadRequestError, UnderflowError
+
+if t.TYPE_CHECKING:
+    from qs.game.market import Market
+
+
+class Order(Struct, frozen=True):
+    day: date
+    symbol: str
+    quantity: int  # negative quantities sell
+
+
+class Rebalance(Struct, frozen=True):
+    weights: dict[str, float]
+    every_days: int = 30
+
+
+class Strategy(Struct, frozen=True):
+    """
+    Dated orders, an optional periodic rebalancing to fixed weights, or
+    both. Orders of a day are filled before that day's rebalancing, all at
+    the day's price; rebalancing sells symbols missing from the weights.
+    """
+    cash: float = 10_000.0
+    orders: list[Order] = []
+    rebalance: Rebalance | None = None
+
+
+class Result(t.NamedTuple):
+    days: list[date]
+    equity: np.ndarray
+    drawdown: np.ndarray
+    cash: np.ndarray
+    dividends: np.ndarray
+    holdings: dict[str, int]
+
+
+class Scenario:
+    """
+    Hashable handle on a session's market. Sessions over the same period
+    and symbols compare equal, so caches of results computed from the
+    market must also be keyed by its digest.
+    """
+    __slots__ = ("_key", "_market", "_start", "_end")
+
+    def __init__(self, period: tuple[datetime, datetime], market: Market):
+        start, end = period
+
+        self._key = (start, end, market.get_symbols())
+        self._market = market
+        self._start = market.offset(start.date())
+        self._end = market.offset(end.date())
+
+
+    def __hash__(self) -> int:
+        return hash(self._key)
+
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Scenario) and self._key == other._key
+
+
+    def get_market(self) -> Market:
+        return self._market
+
+
+    def get_offsets(self) -> tuple[int, int]:
+        """
+        First and last row of the market arrays inside the scenario.
+        """
+        return self._start, self._end
+
+
+def backtest(scenario: Scenario, strategy: Strategy) -> Result:
+    """
+    Daily equity curve, drawdown from the running peak and cumulative
+    dividends of `strategy` over the scenario. Results are cached by the
+    scenario, the digest of its market data and the encoded strategy.
+    """
+    return _backtest(
+        scenario,
+        scenario.get_market().get_digest(),
+        msgspec.json.encode(strategy),
+    )
+
+
+@lru_cache(maxsize=256)
+def _backtest(scenario: Scenario, digest: str, strategy: bytes) -> Result:
+    return run(scenario, msgspec.json.decode(strategy, type=Strategy))
+
+
+def run(scenario: Scenario, strategy: Strategy) -> Result:
+    market = scenario.get_market()
+    first, last = scenario.get_offsets()
+    prices = market.get_price_history()[first:last + 1]
+    dividends = market.get_dividend_history()[first:last + 1]
+    symbols = market.get_symbols()
+
+    trades = np.zeros(prices.shape)
+
+    origin = market.get_origin().toordinal()
+
+    for order in strategy.orders:
+        day = order.day.toordinal() - origin - first
+
+        if order.symbol not in symbols:
+            raise BadRequestError(f"Unknown symbol '{order.symbol}'")
+        if not 0 <= day < len(trades):
+            raise BadRequestError(f"Order on {order.day} is outside the scenario")
+
+        trades[day, market.get_symbol_index(order.symbol)] += order.quantity
+
+    if strategy.rebalance is not None:
+        _rebalance(trades, prices, dividends, symbols, strategy)
+
+    holdings = np.cumsum(trades, axis=0)
+    _check_underflow(holdings, trades, symbols)
+
+    # dividends are paid on what was held at the end of the previous day
+    held = np.vstack((np.zeros(len(symbols)), holdings[:-1]))
+    paid = np.einsum("ij,ij->i", held, dividends)
+    spent = np.einsum("ij,ij->i", trades, prices)
+
+    cash = strategy.cash + np.cumsum(paid - spent)
+    equity = cash + np.einsum("ij,ij->i", holdings, prices)
+    peak = np.maximum.accumulate(equity)
+    drawdown = np.divide(
+        equity - peak,
+        peak,
+        out=np.zeros_like(equity),
+        where=peak > 0,
+    )
+
+    return Result(
+        days=[date.fromordinal(origin + first + day) for day in range(len(equity))],
+        equity=equity,
+        drawdown=drawdown,
+        cash=cash,
+        dividends=np.cumsum(paid),
+        holdings={
+            symbol: int(quantity)
+            for symbol, quantity in zip(symbols, holdings[-1])
+        },
+    )
+
+
+def _rebalance(
+    trades: np.ndarray,
+    prices: np.ndarray,
+    dividends: np.ndarray,
+    symbols: tuple[str, ...],
+    strategy: Strategy,
+) -> None:
+    """
+    Add the trades bringing the portfolio to the target weights, in whole
+    shares, on every rebalancing day.
+    """
+    rebalance = t.cast(Rebalance, strategy.rebalance)
+    weights = np.zeros(len(symbols))
+
+    for symbol, weight in rebalance.weights.items():
+        if symbol not in symbols:
+            raise BadRequestError(f"Unknown symbol '{symbol}'")
+
+        weights[symbols.index(symbol)] = weight
+
+    if rebalance.every_days < 1:
+        raise BadRequestError("Rebalancing must happen at least one day apart")
+    if np.any(weights < 0) or weights.sum() > 1:
+        raise BadRequestError("Weights must be positive and sum to at most 1")
+
+    holdings = np.zeros(len(symbols))
+    cash = strategy.cash
+    previous = 0
+
+    for day in range(0, len(trades), rebalance.every_days):
+        # carry the account from the previous rebalancing up to this day
+        window = slice(previous, day + 1)
+        ends = holdings + np.cumsum(trades[window], axis=0)
+        starts = np.vstack((holdings, ends[:-1]))
+        cash += float(np.einsum("ij,ij->", starts, dividends[window]))
+        cash -= float(np.einsum("ij,ij->", trades[window], prices[window]))
+        holdings = ends[-1]
+
+        equity = cash + prices[day] @ holdings
+        target = np.floor(weights * max(equity, 0) / prices[day])
+
+        trades[day] += target - holdings
+        cash -= float((target - holdings) @ prices[day])
+        holdings = target
+        previous = day + 1
+
+
+def _check_underflow(
+    holdings: np.ndarray,
+    trades: np.ndarray,
+    symbols: tuple[str, ...],
+) -> None:
+    short = np.argwhere(holdings < 0)
+
+    if len(short):
+        day, column = short[0]
+
+        raise UnderflowError(
+            symbol=symbols[column],
+            attempted_reduction=int(-trades[day, column]),
+            current_size=int(holdings[day, column] - trades[day, column]),
+        )
@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+import typing as t
+from datetime import datetime, date, timedelta
+
+import numpy as np
+
+from qs.game.calendar import Resolution
+from qs.game.player import (
+    HOUSING_QUALITIES,
+    LOCATION_TYPES,
+    timed_systems,
+)
+from qs.game.priceMultiplier import PriceMultiplier
+from qs.game.projection import LIFESTYLE_COLUMNS, project
+from qs.game.session import SCENARIO_2008, SCENARIO_2008_SYMBOLS, Session
+
+
+class MemoryReport(t.NamedTuple):
+    players: int
+    session_bytes: int
+    player_bytes: float
+    engine_row_bytes: float
+
+
+class ResolutionReport(t.NamedTuple):
+    resolution: Resolution
+    hours_per_second: float
+    balance_error: float  # mean absolute difference from hourly
+    lifestyle_error: float  # mean absolute difference over all stats
+
+
+def synthetic_market(
+    symbols: tuple[str, ...] = SCENARIO_2008_SYMBOLS,
+    period: tuple[datetime, datetime] = SCENARIO_2008,
+    seed: int = 0,
+) -> tuple[dict[str, dict[date, float]], dict[str, dict[date, float]]]:
+    """
+    Random walk weekday prices and quarterly dividends shaped like the
+    output of `get_stock_prices`, so benchmarks run without network access.
+    """
+    rng = np.random.default_rng(seed)
+    start, end = period[0].date(), period[1].date()
+    days = [
+        start + timedelta(days=offset)
+        for offset in range((end - start).days + 1)
+        if (start + timedelta(days=offset)).weekday() < 5
+    ]
+
+    stock_prices: dict[str, dict[date, float]] = {}
+    dividends: dict[str, dict[date, float]] = {}
+
+    for symbol in symbols:
+        walk = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, len(days))))
+        stock_prices[symbol] = {
+            day: float(price)
+            for day, price in zip(days, walk)
+        }
+        dividends[symbol] = {
+            day: 0.5
+            for day in days[::63]
+        }
+
+    return stock_prices, dividends
+
+
+def synthetic_session(players: int = 0, **kwargs: t.Any) -> Session:
+    stock_prices, dividends = synthetic_market()
+    session = Session(
+        session_id="benchmark",
+        period=SCENARIO_2008,
+        stock_prices=stock_prices,
+        dividends=dividends,
+        **kwargs,
+    )
+
+    for index in range(players):
+        session.add_player(f"player-{index}", is_leader=index == 0)
+
+    return session
+
+
+def measure_memory(players: int = 1000) -> MemoryReport:
+    """
+    Resident bytes allocated by one session and by each of its players.
+    Data shared by the whole process is loaded before measuring.
+    """
+    PriceMultiplier.shared()
+    stock_prices, dividends = synthetic_market()
+
+    gc.collect()
+    tracemalloc.start()
+
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        session = Session(
+            session_id="benchmark",
+            period=SCENARIO_2008,
+            stock_prices=stock_prices,
+            dividends=dividends,
+        )
+        created, _ = tracemalloc.get_traced_memory()
+
+        for index in range(players):
+            session.add_player(f"player-{index}")
+
+        gc.collect()
+        populated, _ = tracemalloc.get_traced_memory()
+
+    finally:
+        tracemalloc.stop()
+
+    engine = session.get_engine()
+
+    return MemoryReport(
+        players=players,
+        session_bytes=created - before,
+        player_bytes=(populated - created) / max(players, 1),
+        engine_row_bytes=engine.get_nbytes() / engine.get_capacity(),
+    )
+
+
+def varied_session(players: int, seed: int = 0, **kwargs: t.Any) -> Session:
+    """
+    Synthetic session whose players have random budgets, accommodations
+    and holdings, so that some of them run into debt.
+    """
+    rng = np.random.default_rng(seed)
+    session = synthetic_session(players=players, **kwargs)
+
+    for index, player in enumerate(session.get_players()):
+        quality = HOUSING_QUALITIES[rng.integers(len(HOUSING_QUALITIES))]
+        location = LOCATION_TYPES[rng.integers(len(LOCATION_TYPES))]
+        sqm = float(rng.integers(20, 120))
+
+        player.set_monthly_food_budget(float(rng.choice([100, 200, 300])))
+        player.set_monthly_leisure_expense(float(rng.uniform(0, 4000)))
+        player.move_accommodation(
+            f"benchmark_{index}", quality, location, sqm,
+        )
+        player.buy_stock(
+            SCENARIO_2008_SYMBOLS[index % len(SCENARIO_2008_SYMBOLS)],
+            int(rng.integers(1, 100)),
+        )
+
+    return session
+
+
+def measure_resolutions(
+    players: int = 100,
+    months: int = 12,
+    hours_per_call: int = 24,
+) -> list[ResolutionReport]:
+    """
+    Simulated hours per second of each resolution, advancing by
+    `hours_per_call` at a time as the scheduler does, and the distance of
+    its players' balance and lifestyle from the hourly simulation after
+    `months` full months.
+
+    Coarse resolutions apply a month's last actions when the next one
+    starts, so the hourly reference stops one hour earlier, before the
+    actions of the first hour of the next month.
+    """
+    start, _ = SCENARIO_2008
+    first = Resolution.MONTHLY.floor(start)
+    months += first.month - 1
+    end = first.replace(year=first.year + months // 12, month=months % 12 + 1)
+
+    finals: dict[Resolution, np.ndarray] = {}
+    speeds: dict[Resolution, float] = {}
+
+    for resolution in Resolution:
+        session = varied_session(players, resolution=resolution)
+        target = end - (
+            timedelta(hours=1)
+            if resolution == Resolution.HOURLY
+            else timedelta(0)
+        )
+        hours = (target - start) // timedelta(hours=1)
+
+        began = time.perf_counter()
+        for offset in range(0, hours, hours_per_call):
+            session.advance(min(hours_per_call, hours - offset))
+        speeds[resolution] = hours / (time.perf_counter() - began)
+
+        engine = session.get_engine()
+        finals[resolution] = np.array([
+            getattr(engine, name)[:players]
+            for name in ("balance",) + LIFESTYLE_COLUMNS
+        ])
+
+    reference = finals[Resolution.HOURLY]
+
+    return [
+        ResolutionReport(
+            resolution=resolution,
+            hours_per_second=speeds[resolution],
+            balance_error=float(np.abs(final[0] - reference[0]).mean()),
+            lifestyle_error=float(np.abs(final[1:] - reference[1:]).mean()),
+        )
+        for resolution, final in finals.items()
+    ]
+
+
+def measure_systems(players: int = 100, days: int = 30) -> dict[str, float]:
+    """
+    Microseconds per player spent in each `Player.tick` system over `days`
+    of a non-vectorized session.
+    """
+    session = synthetic_session(players=players, vectorized=False)
+
+    with timed_systems() as timings:
+        session.advance(days * 24)
+
+    return {
+        name: seconds * 1e6 / players
+        for name, seconds in timings.items()
+    }
+
+
+def measure_projection(paths: int = 500, repeat: int = 20) -> float:
+    """
+    Median milliseconds of projecting one player with random budgets,
+    accommodation and holdings over `paths` paths from the start of the
+    scenario.
+    """
+    player = varied_session(1).get_players()[0]
+    project(player, paths=paths, seed=0)
+
+    timings = []
+    for _ in range(repeat):
+        began = time.perf_counter()
+        project(player, paths=paths, seed=0)
+        timings.append(time.perf_counter() - began)
+
+    return float(np.median(timings)) * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Session memory benchmark.")
+    parser.add_argument("--players", type=int, default=1000)
+    parser.add_argument(
+        "--systems",
+        type=int,
+        metavar="DAYS",
+        help="Time the player tick systems over this many days instead.",
+    )
+    parser.add_argument(
+        "--resolutions",
+        type=int,
+        metavar="MONTHS",
+        help="Compare the resolutions over this many months instead.",
+    )
+    parser.add_argument(
+        "--projection",
+        type=int,
+        metavar="PATHS",
+        help="Time a projection over this many paths instead.",
+    )
+    args = parser.parse_args()
+
+    if args.projection is not None:
+        millis = measure_projection(paths=args.projection)
+        print(f"projection: {millis:.0f} ms")  # noqa: T201
+
+        return
+
+    if args.resolutions is not None:
+        reports = measure_resolutions(
+            players=args.players,
+            months=args.resolutions,
+        )
+
+        for report in reports:
+            print(  # noqa: T201
+                f"{report.resolution + ':':<9}"
+                f"{report.hours_per_second:>9.0f} hours/s  "
+                f"balance error {report.balance_error:.4g}  "
+                f"lifestyle error {report.lifestyle_error:.4g}"
+            )
+
+        return
+
+    if args.systems is not None:
+        timings = measure_systems(players=args.players, days=args.systems)
+
+        for name, micros in timings.items():
+            print(f"{name + ':':<19}{micros:.0f} us/player")  # noqa: T201
+
+        return
+
+    report = measure_memory(players=args.players)
+
+    print(f"players:          {report.players}")  # noqa: T201
+    print(f"bytes/session:    {report.session_bytes}")  # noqa: T201
+    print(f"bytes/player:     {report.player_bytes:.0f}")  # noqa: T201
+    print(f"engine bytes/row: {report.engine_row_bytes:.0f}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
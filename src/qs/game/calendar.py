@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import typing as t
+from datetime import date, datetime, timedelta
+from enum import IntFlag, StrEnum
+
+import numpy as np
+
+
+MEAL_HOURS = (6, 12, 18)
+LIFESTYLE_HOURS = (0, 6, 12, 18)
+
+
+class Action(IntFlag):
+    NONE = 0
+    MEAL = 1
+    DAILY = 2
+    MONTHLY = 4
+    LIFESTYLE = 8
+    DIVIDEND = 16
+    EVENT = 32
+
+
+class Resolution(StrEnum):
+    """
+    How finely a session applies its calendar actions. Monthly batches are
+    several times faster than hourly steps. A daily batch costs about as
+    much as the few vectorized steps of a day, so daily trades a little
+    accuracy for almost no speedup. It is kept for its per-day order fills
+    and price multipliers, not for throughput.
+    """
+    HOURLY = "hourly"  # every action applied at its hour
+    DAILY = "daily"  # the actions of a day applied at once, at its end
+    MONTHLY = "monthly"  # the actions of a month applied at once, at its end
+
+    def floor(self, time: datetime) -> datetime:
+        """
+        Start of the period containing `time`.
+        """
+        time = time.replace(minute=0, second=0, microsecond=0)
+
+        if self == Resolution.HOURLY:
+            return time
+
+        time = time.replace(hour=0)
+
+        if self == Resolution.MONTHLY:
+            return time.replace(day=1)
+
+        return time
+
+
+def actions_at(
+    time: datetime,
+    dividend_dates: t.Container[date] = (),
+    event_dates: t.Container[date] = (),
+) -> Action:
+    """
+    Return the actions due at the given simulated hour.
+    """
+    actions = Action.NONE
+
+    if time.hour == 0:
+        actions |= Action.DAILY
+
+        if time.day == 1:
+            actions |= Action.MONTHLY
+
+        if time.date() in dividend_dates:
+            actions |= Action.DIVIDEND
+
+        if time.date() in event_dates:
+            actions |= Action.EVENT
+
+    if time.hour in MEAL_HOURS:
+        actions |= Action.MEAL
+
+    if time.hour in LIFESTYLE_HOURS:
+        actions |= Action.LIFESTYLE
+
+    return actions
+
+
+class Calendar:
+    """
+    Precomputed, sorted list of the simulated hours at which anything
+    happens in a scenario. Every other hour is a no-op and can be skipped.
+    """
+    def __init__(
+        self,
+        period: tuple[datetime, datetime],
+        dividend_dates: t.Iterable[date] = (),
+        event_dates: t.Iterable[date] = (),
+    ):
+        start_time, end_time = period
+        self._origin = start_time.replace(
+            hour=0, minute=0, second=0, microsecond=0,
+        )
+        self._dividend_dates = frozenset(dividend_dates)
+        self._event_dates = frozenset(event_dates)
+
+        hours: list[int] = []
+        actions: list[int] = []
+
+        time = self._origin
+        while time <= end_time:
+            action = actions_at(
+                time,
+                self._dividend_dates,
+                self._event_dates,
+            )
+
+            if action and time > start_time:
+                hours.append(self._offset(time))
+                actions.append(action)
+
+            time += timedelta(hours=1)
+
+        self._hours = np.array(hours, dtype=np.int64)
+        self._actions = np.array(actions, dtype=np.int64)
+
+
+    def __len__(self) -> int:
+        return len(self._hours)
+
+
+    def _offset(self, time: datetime) -> int:
+        return int((time - self._origin) // timedelta(hours=1))
+
+
+    def has_dividends(self, day: date) -> bool:
+        return day in self._dividend_dates
+
+
+    def has_events(self, day: date) -> bool:
+        return day in self._event_dates
+
+
+    def between(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+    ) -> t.Iterator[tuple[datetime, Action]]:
+        """
+        Yield action points in the half-open interval (start_time, end_time].
+        """
+        lo = np.searchsorted(self._hours, self._offset(start_time), "right")
+        hi = np.searchsorted(self._hours, self._offset(end_time), "right")
+
+        hours = self._hours[lo:hi].tolist()
+        actions = self._actions[lo:hi].tolist()
+
+        for hour, action in zip(hours, actions):
+            yield self._origin + timedelta(hours=hour), Action(action)
@@ -0,0 +1,930 @@
+from __future__ import annotations
+
+import typing as t
+
+import numpy as np
+
+from qs.game.calendar import Action
+from qs.game.ledger import LineItem
+from qs.game.life_events import (
+    HAPPINESS as LIFE_EVENT_HAPPINESS,
+    NEVER,
+    LifeEvent,
+)
+from qs.game.shocks import SHOCK_HAPPINESS, SHOCK_STRESS
+from qs.game.player import (
+    FOOD_TYPES,
+    HOUSING_QUALITIES,
+    LOCATION_TYPES,
+    BaseDecays,
+)
+
+
+FOOD_HEALTH = np.array([food.value["health"] for food in FOOD_TYPES], dtype=float)
+FOOD_COST = np.array([food.value["cost"] for food in FOOD_TYPES], dtype=float)
+HOUSING_HAPPINESS = np.array(
+    [quality.value["happiness"] for quality in HOUSING_QUALITIES],
+    dtype=float,
+)
+HOUSING_COMFORT = np.array(
+    [quality.value["comfort"] for quality in HOUSING_QUALITIES],
+    dtype=float,
+)
+HOUSING_COST = np.array(
+    [quality.value["cost"] for quality in HOUSING_QUALITIES],
+    dtype=float,
+)
+LOCATION_COMFORT = np.array(
+    [location.value["comfort"] for location in LOCATION_TYPES],
+    dtype=float,
+)
+LOCATION_COST = np.array(
+    [location.value["cost"] for location in LOCATION_TYPES],
+    dtype=float,
+)
+
+
+def load_tables() -> None:
+    """
+    Refresh the lookup arrays in place from the enum tables, after those
+    were modified (see `qs.game.simulate.overridden`).
+    """
+    FOOD_HEALTH[:] = [food.value["health"] for food in FOOD_TYPES]
+    FOOD_COST[:] = [food.value["cost"] for food in FOOD_TYPES]
+    HOUSING_HAPPINESS[:] = [
+        quality.value["happiness"] for quality in HOUSING_QUALITIES
+    ]
+    HOUSING_COMFORT[:] = [
+        quality.value["comfort"] for quality in HOUSING_QUALITIES
+    ]
+    HOUSING_COST[:] = [quality.value["cost"] for quality in HOUSING_QUALITIES]
+    LOCATION_COMFORT[:] = [
+        location.value["comfort"] for location in LOCATION_TYPES
+    ]
+    LOCATION_COST[:] = [location.value["cost"] for location in LOCATION_TYPES]
+
+
+WINTER_MONTHS = (11, 12, 1, 2)
+SUMMER_MONTHS = (6, 7, 8)
+
+# calendar days over which the portfolio performance felt by players is
+# measured, fewer at the start of the price history; prices are indexed by
+# calendar day, so weekends and holidays repeat the last close
+PERFORMANCE_WINDOW = 30
+
+# closed-form interest refinements of inexact `Engine.fast_forward` runs
+INTEREST_PASSES = 3
+
+# rows up to which exact walks are stepped row by row on plain floats
+SCALAR_WALK_ROWS = 8
+
+DAILY_LINES = [LineItem.TRANSPORTATION, LineItem.LEISURE]
+MONTHLY_LINES = [
+    LineItem.SALARY,
+    LineItem.RENT,
+    LineItem.UTILITIES,
+    LineItem.LOAN,
+    LineItem.TAXES,
+]
+
+FLOAT_COLUMNS = (
+    "balance",
+    "salary",
+    "grocery_budget",
+    "leisure_budget",
+    "sqm",
+    "health",
+    "happiness",
+    "energy",
+    "social_life",
+    "stress_level",
+    "living_comfort",
+    "career_progress",
+    "skills_education",
+    "stock_value",
+    "window_value",
+)
+
+CODE_COLUMNS = (
+    "food_type",
+    "housing_quality",
+    "location_type",
+    "employed",
+)
+
+MATRIX_COLUMNS = (
+    "holdings",
+    "entry_prices",
+    "ledger",
+)
+
+COUNTER_COLUMNS = (
+    "revision",
+    "life_event_cursor",
+)
+
+COLUMNS = FLOAT_COLUMNS + CODE_COLUMNS + MATRIX_COLUMNS + COUNTER_COLUMNS
+
+# flat arrays of the life event schedules of all rows, see
+# `Engine.schedule_life_events`
+SCHEDULE_COLUMNS = (
+    "life_event_days",
+    "life_events",
+    "life_event_postings",
+)
+
+
+class Engine:
+    """
+    Struct-of-arrays store for every player in a session.
+
+    Each player owns one row. `step` advances all rows at once and mirrors
+    `Player.tick` operation by operation, so both paths produce identical
+    floats.
+    """
+    balance: np.ndarray
+    salary: np.ndarray
+    grocery_budget: np.ndarray
+    leisure_budget: np.ndarray
+    sqm: np.ndarray
+    health: np.ndarray
+    happiness: np.ndarray
+    energy: np.ndarray
+    social_life: np.ndarray
+    stress_level: np.ndarray
+    living_comfort: np.ndarray
+    career_progress: np.ndarray
+    skills_education: np.ndarray
+    stock_value: np.ndarray
+    window_value: np.ndarray
+    food_type: np.ndarray
+    housing_quality: np.ndarray
+    location_type: np.ndarray
+    employed: np.ndarray
+    holdings: np.ndarray
+    entry_prices: np.ndarray
+    ledger: np.ndarray
+    life_event_days: np.ndarray
+    life_events: np.ndarray
+    life_event_postings: np.ndarray
+    revision: np.ndarray
+    life_event_cursor: np.ndarray
+
+    def __init__(self, symbols: t.Sequence[str], capacity: int = 32):
+        self._symbols = tuple(symbols)
+        self._symbol_index = {
+            symbol: index
+            for index, symbol in enumerate(self._symbols)
+        }
+        self._size = 0
+        self._capacity = capacity
+
+        for name in FLOAT_COLUMNS:
+            setattr(self, name, np.zeros(capacity, dtype=np.float64))
+
+        for name in CODE_COLUMNS:
+            setattr(self, name, np.zeros(capacity, dtype=np.int8))
+
+        self.holdings = np.zeros((capacity, len(self._symbols)), dtype=np.int64)
+        self.entry_prices = np.zeros((capacity, len(self._symbols)))
+
+        # running total of every player's postings per `LineItem`
+        self.ledger = np.zeros((capacity, len(LineItem)))
+
+        # the pre-sampled `LifeEvent` schedules of all players, one block
+        # per player sorted by day and ended by `NEVER`, and the index of
+        # each player's next event; the first entry ends every empty block
+        self._scheduled = 1
+        self.life_event_days = np.full(capacity * 8 + 1, NEVER, dtype=np.int64)
+        self.life_events = np.zeros(capacity * 8 + 1, dtype=np.int8)
+        self.life_event_postings = np.zeros(capacity * 8 + 1)
+        self.life_event_cursor = np.zeros(capacity, dtype=np.int64)
+
+        # bumped whenever a player's budgets, accommodation or holdings change
+        self.revision = np.zeros(capacity, dtype=np.int64)
+
+
+    def __len__(self) -> int:
+        return self._size
+
+
+    def get_capacity(self) -> int:
+        return self._capacity
+
+
+    def get_nbytes(self) -> int:
+        """
+        Bytes held by the column arrays, including unused capacity.
+        """
+        return sum(
+            getattr(self, name).nbytes
+            for name in COLUMNS + SCHEDULE_COLUMNS
+        )
+
+
+    def get_symbols(self) -> tuple[str, ...]:
+        return self._symbols
+
+
+    def get_symbol_index(self, symbol: str) -> int:
+        return self._symbol_index[symbol]
+
+
+    def extract(self, rows: t.Sequence[int]) -> Engine:
+        """
+        New engine holding copies of the given rows, in order.
+        """
+        engine = Engine(self._symbols, capacity=max(len(rows), 1))
+
+        for _ in rows:
+            engine.allocate()
+
+        for name in COLUMNS:
+            getattr(engine, name)[:len(rows)] = getattr(self, name)[list(rows)]
+
+        # only the events still due are copied
+        for index, row in enumerate(rows):
+            start = self.life_event_cursor[row]
+            end = start + np.argmax(self.life_event_days[start:] == NEVER)
+            engine.schedule_life_events(
+                index,
+                self.life_event_days[start:end],
+                self.life_events[start:end],
+                self.life_event_postings[start:end],
+            )
+
+        return engine
+
+
+    def dump_columns(self) -> dict[str, bytes]:
+        """
+        Raw bytes of every column over the allocated rows, and of the
+        life event schedules.
+        """
+        columns = {
+            name: getattr(self, name)[:self._size].tobytes()
+            for name in COLUMNS
+        }
+        columns.update(
+            (name, getattr(self, name)[:self._scheduled].tobytes())
+            for name in SCHEDULE_COLUMNS
+        )
+
+        return columns
+
+
+    def load_columns(self, columns: dict[str, bytes]) -> None:
+        """
+        Overwrite the leading rows with columns from `dump_columns`. The
+        rows must already be allocated.
+        """
+        for name, data in columns.items():
+            column = getattr(self, name)
+
+            if name in SCHEDULE_COLUMNS:
+                setattr(self, name, np.frombuffer(data, column.dtype).copy())
+                self._scheduled = len(getattr(self, name))
+                continue
+
+            rows = np.frombuffer(data, dtype=column.dtype)
+            rows = rows.reshape(-1, *column.shape[1:])
+            column[:len(rows)] = rows
+
+
+    def allocate(self) -> int:
+        """
+        Reserve a row for a new player and return its index.
+        """
+        if self._size == self._capacity:
+            self._grow(self._capacity * 2)
+
+        row = self._size
+        self._size += 1
+        self.employed[row] = 1
+        return row
+
+
+    def _grow(self, capacity: int) -> None:
+        for name in COLUMNS:
+            old = getattr(self, name)
+            new = np.zeros((capacity, *old.shape[1:]), dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+        self._capacity = capacity
+
+
+    def schedule_life_events(
+        self,
+        row: int,
+        days: np.ndarray,
+        events: np.ndarray,
+        postings: np.ndarray,
+    ) -> None:
+        """
+        Set a row's life event schedule, sorted by day, appending it to the
+        schedules of all rows. A row's previous schedule is left unused.
+        """
+        start = self._scheduled
+        end = start + len(days) + 1
+
+        if end > len(self.life_event_days):
+            size = max(end, 2 * len(self.life_event_days))
+
+            for name in SCHEDULE_COLUMNS:
+                old = getattr(self, name)
+                new = np.zeros(size, dtype=old.dtype)
+                new[:start] = old[:start]
+                setattr(self, name, new)
+
+        self.life_event_days[start:end - 1] = days
+        self.life_event_days[end - 1] = NEVER
+        self.life_events[start:end] = np.append(events, 0)
+        self.life_event_postings[start:end] = np.append(postings, 0.0)
+        self.life_event_cursor[row] = start
+        self._scheduled = end
+
+
+    def mark_to_market(
+        self,
+        prices: np.ndarray,
+        window_prices: np.ndarray,
+        row: int | None = None,
+    ) -> None:
+        """
+        Value the holdings of one row, or of every row, at `prices` and at
+        `window_prices`, the prices `PERFORMANCE_WINDOW` calendar days
+        earlier. Called once per day and after every trade, so the rolling
+        performance never needs the price history in between.
+        """
+        rows = slice(0, self._size) if row is None else slice(row, row + 1)
+
+        self.stock_value[rows] = self.holdings[rows] @ prices
+        self.window_value[rows] = self.holdings[rows] @ window_prices
+
+
+    def get_portfolio_performance(self) -> np.ndarray:
+        """
+        Return of each row's current holdings over the performance window,
+        0 without holdings.
+        """
+        n = self._size
+        return _performance(self.stock_value[:n], self.window_value[:n])
+
+
+    def get_monthly_expenses(self, multiplier: float) -> np.ndarray:
+        """
+        Vectorized `Player.get_monthly_expenses`.
+        """
+        n = self._size
+        rent = (
+            HOUSING_COST[self.housing_quality[:n]] +
+            LOCATION_COST[self.location_type[:n]]
+        ) * multiplier
+        utilities = (100 + (self.sqm[:n] * 2)) * multiplier
+        grocery = FOOD_COST[self.food_type[:n]]
+        transportation = 150 * multiplier
+
+        return (
+            rent +
+            utilities +
+            grocery +
+            transportation +
+            self.leisure_budget[:n] +
+            400 +
+            500
+        )
+
+
+    def step(
+        self,
+        actions: Action,
+        month: int,
+        multiplier: float,
+        dividends: np.ndarray | None = None,
+        shock: float = 0.0,
+        day: int = 0,
+    ) -> None:
+        """
+        Run the given calendar actions for every player. `dividends` holds
+        today's dividend per share for each symbol on dividend days,
+        `shock` today's market shock and `day` today's ordinal.
+
+        The postings of all actions are collected as line items and applied
+        to the balance as a single net movement per player.
+        """
+        n = self._size
+        posting = actions & (
+            Action.DAILY | Action.DIVIDEND | Action.MONTHLY | Action.MEAL
+        )
+
+        fired = np.zeros(n, dtype=np.int8)
+
+        if posting:
+            lines = np.zeros((n, len(LineItem)))
+
+            if actions & Action.DAILY:
+                self._post_daily(lines, multiplier)
+
+            if actions & Action.DIVIDEND:
+                assert dividends is not None
+                self._receive_dividends(lines, dividends)
+
+            if actions & Action.MONTHLY:
+                self._post_monthly(lines, multiplier)
+
+            if actions & Action.MEAL:
+                self._buy_meals(lines)
+
+            # after the salary, so a job loss stops the next one
+            if actions & Action.DAILY:
+                fired = self._post_life_events(lines, day)
+
+            self.balance[:n] += lines.sum(axis=1)
+            self.ledger[:n] += lines
+
+        if actions & Action.LIFESTYLE:
+            self._update_lifestyle(month, multiplier, shock, fired)
+
+
+    def fast_forward(
+        self,
+        actions: t.Sequence[Action],
+        month: int,
+        multiplier: float,
+        dividends: np.ndarray,
+        prices: np.ndarray,
+        window_prices: np.ndarray,
+        shocks: np.ndarray,
+        days: np.ndarray,
+        exact: bool = True,
+    ) -> None:
+        """
+        Apply a run of calendar actions falling into a single month in one
+        batch. `dividends`, `prices` and `window_prices` have one row per
+        action with the dividend per share, the price and the price
+        `PERFORMANCE_WINDOW` calendar days earlier of each symbol, and
+        `shocks` and `days` the market shock and the day's ordinal of each
+        action.
+
+        Balance postings are summed with a cumulative sum (or a loop over
+        the postings when overdraft interest is due) and the lifestyle stats
+        with a constant per-update change are advanced in closed form; only
+        energy and stress, which depend on the running health and balance,
+        are stepped through in a loop, as is happiness on runs with market
+        shocks or life events. Results match `step` up to floating
+        point summation order.
+
+        With `exact` unset both loops are replaced by closed forms: interest
+        does not compound within the run, and energy and stress end where a
+        walk clipped at a single bound would. The error only grows with runs
+        long enough to cross from one bound to the other.
+        """
+        n = self._size
+        codes = np.array([int(action) for action in actions], dtype=np.int64)
+        daily = (codes & Action.DAILY) != 0
+        dividend = (codes & Action.DIVIDEND) != 0
+        monthly = (codes & Action.MONTHLY) != 0
+        meal = (codes & Action.MEAL) != 0
+        lifestyle = (codes & Action.LIFESTYLE) != 0
+
+        # the per-player amount of each line item is the same on every
+        # action of the run, except for interest and dividends
+        amounts = np.zeros((n, len(LineItem)))
+        self._post_daily(amounts, multiplier)
+        self._post_monthly(amounts, multiplier)
+        self._buy_meals(amounts)
+        amounts[:, LineItem.INTEREST] = 0.0
+
+        # salaries depend on the employment before each day's life events
+        life, fired, employment = self._collect_life_events(days, daily)
+        salaries = employment[:-1][monthly] * self.salary[:n]
+        amounts[:, LineItem.SALARY] = 0.0
+
+        occurrences = np.zeros(len(LineItem))
+        occurrences[DAILY_LINES] = daily.sum()
+        occurrences[MONTHLY_LINES] = monthly.sum()
+        occurrences[LineItem.GROCERIES] = meal.sum()
+
+        received = dividends[dividend] @ self.holdings[:n].T
+
+        postings = np.zeros((len(codes), n))
+        postings[daily] += amounts[:, DAILY_LINES].sum(axis=1)
+        postings[dividend] += received
+        postings[monthly] += amounts[:, MONTHLY_LINES].sum(axis=1) + salaries
+        postings[meal] += amounts[:, LineItem.GROCERIES]
+        postings += life
+
+        self.ledger[:n] += amounts * occurrences
+        self.ledger[:n, LineItem.SALARY] += salaries.sum(axis=0)
+        self.ledger[:n, LineItem.LIFE_EVENTS] += life.sum(axis=0)
+        self.ledger[:n, LineItem.DIVIDENDS] += received.sum(axis=0)
+
+        balances = self.balance[:n] + np.cumsum(postings, axis=0)
+
+        if not exact:
+            # Overdraft interest on the balance before each day's postings.
+            # Each pass charges interest on the interest of the previous
+            # one, so compounding within the run is accounted for up to
+            # the second order.
+            interest = np.zeros((len(codes), n))
+            before = balances - postings
+
+            for _ in range(INTEREST_PASSES):
+                interest[daily] = np.minimum(before[daily] * (0.4 / 365), 0.0)
+                before = balances + np.cumsum(interest, axis=0) - postings - interest
+
+            balances += np.cumsum(interest, axis=0)
+            self.ledger[:n, LineItem.INTEREST] += interest.sum(axis=0)
+
+        # overdraft interest compounds daily, so step through the postings
+        elif np.any((balances - postings)[daily] < 0):
+            balance = self.balance[:n].copy()
+            accrued = np.zeros(n)
+
+            for index in range(len(codes)):
+                if daily[index]:
+                    interest = np.where(balance < 0, balance * (0.4 / 365), 0.0)
+                    balance += interest
+                    accrued += interest
+
+                balance += postings[index]
+                balances[index] = balance
+
+            self.ledger[:n, LineItem.INTEREST] += accrued
+
+        self.balance[:n] = balances[-1]
+        self.mark_to_market(prices[-1], window_prices[-1])
+
+        balances = balances[lifestyle]
+        updates = len(balances)
+
+        if updates == 0:
+            return
+
+        counts = np.arange(1, updates + 1)[:, None]
+        leisure = self.leisure_budget[:n] / multiplier
+        daily_leisure = self.leisure_budget[:n] / multiplier / 30
+
+        health_change = (
+            FOOD_HEALTH[self.food_type[:n]] +
+            BaseDecays.HEALTH.value +
+            leisure / 50
+        )
+        if month in WINTER_MONTHS:
+            health_change -= 2
+        healths = np.clip(self.health[:n] + counts * health_change, 0, 100)
+        self.health[:n] = healths[-1]
+
+        shocks = shocks[lifestyle][:, None]
+        events = LIFE_EVENT_HAPPINESS[fired[lifestyle]]
+        happiness_changes = (
+            HOUSING_HAPPINESS[self.housing_quality[:n]] +
+            (events - SHOCK_HAPPINESS * shocks) +
+            BaseDecays.HAPPINESS.value +
+            daily_leisure / 10
+        )
+        varying = bool(np.any(shocks) or np.any(events))
+        if not varying:
+            self.happiness[:n] = np.clip(
+                self.happiness[:n] + updates * happiness_changes[0], 0, 100,
+            )
+
+        work_impact = -2  # 40 work hours per week
+        social_life_change = (
+            np.where(daily_leisure > 100, daily_leisure / 100, -1) +
+            BaseDecays.SOCIAL_LIFE.value -
+            work_impact
+        )
+        self.social_life[:n] = np.clip(
+            self.social_life[:n] + updates * social_life_change, 0, 100,
+        )
+
+        self.living_comfort[:n] = np.clip(
+            HOUSING_COMFORT[self.housing_quality[:n]] +
+            LOCATION_COMFORT[self.location_type[:n]] +
+            self.sqm[:n],
+            0,
+            100,
+        )
+
+        employed = employment[1:][lifestyle]
+        career_progress_changes = np.where(
+            employed == 1,
+            BaseDecays.CAREER.value + (daily_leisure / 2000),
+            -2,
+        )
+        switching = bool(np.any(employed != employed[0]))
+        if not switching:
+            self.career_progress[:n] = np.clip(
+                self.career_progress[:n] + updates * career_progress_changes[0],
+                0,
+                100,
+            )
+
+        self.skills_education[:n] = np.clip(
+            self.skills_education[:n] + updates * (2 / 24), 0, 100,
+        )
+
+        work_loss = -2  # 32 work hours per week
+        seasonal_bonus = .1 if month in SUMMER_MONTHS \
+            else -.1 if month in WINTER_MONTHS else 0
+        energy_changes = (
+            np.where(healths > 80, 2, 0) +
+            seasonal_bonus -
+            (100 - healths) / 2 -
+            work_loss
+        )
+
+        # holdings do not change within the run
+        values = prices[lifestyle] @ self.holdings[:n].T
+        performance = _performance(
+            values, window_prices[lifestyle] @ self.holdings[:n].T,
+        )
+
+        monthly_expenses = self.get_monthly_expenses(multiplier)
+        stress_changes = np.where(
+            balances < monthly_expenses,
+            20,
+            np.where(balances > monthly_expenses * 6, -10, 0),
+        ) + SHOCK_STRESS * shocks + np.trunc(
+            -performance * values / monthly_expenses
+        )
+
+        if not exact:
+            if varying:
+                self.happiness[:n] = _clipped_walk(
+                    self.happiness[:n], happiness_changes,
+                )
+            if switching:
+                self.career_progress[:n] = _clipped_walk(
+                    self.career_progress[:n], career_progress_changes,
+                )
+            self.energy[:n] = _clipped_walk(self.energy[:n], energy_changes)
+            self.stress_level[:n] = _clipped_walk(
+                self.stress_level[:n], stress_changes,
+            )
+            return
+
+        if varying:
+            _walk(self.happiness[:n], happiness_changes)
+        if switching:
+            _walk(self.career_progress[:n], career_progress_changes)
+        _walk(self.energy[:n], energy_changes)
+        _walk(self.stress_level[:n], stress_changes)
+
+
+    def _post_daily(self, lines: np.ndarray, multiplier: float) -> None:
+        n = self._size
+        balance = self.balance[:n]
+
+        # on a negative balance, incur daily interest 40% APR
+        lines[:, LineItem.INTEREST] = np.where(
+            balance < 0, balance * (0.4 / 365), 0.0,
+        )
+        lines[:, LineItem.TRANSPORTATION] = -(150 * multiplier * 12 / 365)
+        lines[:, LineItem.LEISURE] = -(self.leisure_budget[:n] * 12 / 365)
+
+
+    def _post_life_events(self, lines: np.ndarray, day: int) -> np.ndarray:
+        """
+        Post the life events due by `day` of every row, checking only the
+        head of each schedule. Returns the events fired per row.
+        """
+        n = self._size
+        cursor = self.life_event_cursor[:n]
+        fired = np.zeros(n, dtype=np.int8)
+
+        due = np.flatnonzero(self.life_event_days[cursor] <= day)
+        while len(due):
+            events = self.life_events[cursor[due]]
+            lines[due, LineItem.LIFE_EVENTS] += \
+                self.life_event_postings[cursor[due]]
+            fired[due] |= events
+            self._update_employment(due, events)
+            cursor[due] += 1
+            due = due[self.life_event_days[cursor[due]] <= day]
+
+        return fired
+
+
+    def _update_employment(self, rows: np.ndarray, events: np.ndarray) -> None:
+        """
+        Apply the job losses and rehires among one event of each row.
+        """
+        lost = (events & LifeEvent.JOB_LOSS) != 0
+        rehired = (events & LifeEvent.REHIRE) != 0
+
+        self.employed[rows[lost]] = 0
+        self.employed[rows[rehired]] = 1
+        self.revision[rows[lost | rehired]] += 1
+
+
+    def _collect_life_events(
+        self,
+        days: np.ndarray,
+        daily: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Postings and events of the life events falling due on the daily
+        actions of a `fast_forward` run, by action and row, and the
+        employment of every row before the first action and after each.
+        """
+        n = self._size
+        postings = np.zeros((len(days), n))
+        fired = np.zeros((len(days), n), dtype=np.int8)
+        indices = np.flatnonzero(daily)
+
+        # employment set by the action's events, -1 where unchanged
+        changes = np.full((len(days) + 1, n), -1, dtype=np.int8)
+        changes[0] = self.employed[:n]
+
+        if len(indices) == 0:
+            return postings, fired, _forward_fill(changes)
+
+        cursor = self.life_event_cursor[:n]
+        last = days[indices[-1]]
+
+        due = np.flatnonzero(self.life_event_days[cursor] <= last)
+        while len(due):
+            # the first daily action on or after the event's day
+            heads = self.life_event_days[cursor[due]]
+            at = indices[np.searchsorted(days[indices], heads)]
+
+            events = self.life_events[cursor[due]]
+            postings[at, due] += self.life_event_postings[cursor[due]]
+            fired[at, due] |= events
+            self._update_employment(due, events)
+            changed = (events & (LifeEvent.JOB_LOSS | LifeEvent.REHIRE)) != 0
+            changes[at[changed] + 1, due[changed]] = \
+                self.employed[due[changed]]
+            cursor[due] += 1
+            due = due[self.life_event_days[cursor[due]] <= last]
+
+        return postings, fired, _forward_fill(changes)
+
+
+    def _receive_dividends(self, lines: np.ndarray, dividends: np.ndarray) -> None:
+        n = self._size
+        received = np.zeros(n)
+
+        for index in range(len(self._symbols)):
+            received += dividends[index] * self.holdings[:n, index]
+
+        lines[:, LineItem.DIVIDENDS] = received
+
+
+    def _post_monthly(self, lines: np.ndarray, multiplier: float) -> None:
+        n = self._size
+
+        lines[:, LineItem.SALARY] = self.salary[:n] * self.employed[:n]
+        lines[:, LineItem.RENT] = -(
+            HOUSING_COST[self.housing_quality[:n]] +
+            LOCATION_COST[self.location_type[:n]]
+        ) * multiplier
+        lines[:, LineItem.UTILITIES] = -(100 + (self.sqm[:n] * 2)) * multiplier
+        lines[:, LineItem.LOAN] = -400
+        lines[:, LineItem.TAXES] = -500
+
+
+    def _buy_meals(self, lines: np.ndarray) -> None:
+        n = self._size
+        lines[:, LineItem.GROCERIES] = -(FOOD_COST[self.food_type[:n]] * 4 / 365)
+
+
+    def _update_lifestyle(
+        self,
+        month: int,
+        multiplier: float,
+        shock: float,
+        fired: np.ndarray,
+    ) -> None:
+        n = self._size
+        leisure = self.leisure_budget[:n] / multiplier
+        daily_leisure = self.leisure_budget[:n] / multiplier / 30
+
+        health = self.health[:n]
+        health += (
+            FOOD_HEALTH[self.food_type[:n]] +
+            BaseDecays.HEALTH.value +
+            leisure / 50
+        )
+        if month in WINTER_MONTHS:
+            health -= 2
+        np.clip(health, 0, 100, out=health)
+
+        happiness = self.happiness[:n]
+        happiness += (
+            HOUSING_HAPPINESS[self.housing_quality[:n]] +
+            (LIFE_EVENT_HAPPINESS[fired] - SHOCK_HAPPINESS * shock) +
+            BaseDecays.HAPPINESS.value +
+            daily_leisure / 10
+        )
+        np.clip(happiness, 0, 100, out=happiness)
+
+        health_gain = np.where(health > 80, 2, 0)
+        health_loss = (100 - health) / 2
+        work_loss = -2  # 32 work hours per week
+        seasonal_bonus = .1 if month in SUMMER_MONTHS \
+            else -.1 if month in WINTER_MONTHS else 0
+        energy = self.energy[:n]
+        energy += health_gain + seasonal_bonus - health_loss - work_loss
+        np.clip(energy, 0, 100, out=energy)
+
+        work_impact = -2  # 40 work hours per week
+        social_life = self.social_life[:n]
+        social_life += (
+            np.where(daily_leisure > 100, daily_leisure / 100, -1) +
+            BaseDecays.SOCIAL_LIFE.value -
+            work_impact
+        )
+        np.clip(social_life, 0, 100, out=social_life)
+
+        monthly_expenses = self.get_monthly_expenses(multiplier)
+        balance = self.balance[:n]
+        stress_level = self.stress_level[:n]
+        stress_level += np.where(
+            balance < monthly_expenses,
+            20,
+            np.where(balance > monthly_expenses * 6, -10, 0),
+        ) + SHOCK_STRESS * shock + np.trunc(
+            -self.get_portfolio_performance() *
+            self.stock_value[:n] /
+            monthly_expenses
+        )
+        np.clip(stress_level, 0, 100, out=stress_level)
+
+        self.living_comfort[:n] = (
+            HOUSING_COMFORT[self.housing_quality[:n]] +
+            LOCATION_COMFORT[self.location_type[:n]] +
+            self.sqm[:n]
+        )
+        np.clip(self.living_comfort[:n], 0, 100, out=self.living_comfort[:n])
+
+        career_progress = self.career_progress[:n]
+        career_progress += np.where(
+            self.employed[:n] == 1,
+            BaseDecays.CAREER.value + (daily_leisure / 2000),
+            -2,
+        )
+        np.clip(career_progress, 0, 100, out=career_progress)
+
+        skills_education = self.skills_education[:n]
+        skills_education += 2 / 24
+        np.clip(skills_education, 0, 100, out=skills_education)
+
+
+def _performance(values: np.ndarray, window_values: np.ndarray) -> np.ndarray:
+    return np.divide(
+        values,
+        window_values,
+        out=np.ones_like(values),
+        where=window_values > 0,
+    ) - 1
+
+
+def _forward_fill(changes: np.ndarray) -> np.ndarray:
+    """
+    Rows of `changes` with every -1 replaced by the last value above it.
+    """
+    steps = np.arange(len(changes))[:, None]
+    last = np.maximum.accumulate(np.where(changes >= 0, steps, 0), axis=0)
+
+    return np.take_along_axis(changes, last, axis=0)
+
+
+def _walk(levels: np.ndarray, changes: np.ndarray) -> None:
+    """
+    Walk `levels` in place through the rows of `changes`, clipped to
+    [0, 100] after every step as `Engine.step` does. Few rows, such as the
+    single row of a projection, are walked on plain floats, which is much
+    faster than a numpy call per step.
+    """
+    if len(levels) > SCALAR_WALK_ROWS:
+        for change in changes:
+            levels += change
+            np.clip(levels, 0, 100, out=levels)
+        return
+
+    for row, level in enumerate(levels.tolist()):
+        for change in changes[:, row].tolist():
+            level = min(max(level + change, 0.0), 100.0)
+        levels[row] = level
+
+
+def _clipped_walk(
+    start: np.ndarray,
+    changes: np.ndarray,
+    low: float = 0,
+    high: float = 100,
+) -> np.ndarray:
+    """
+    End of walks from `start` through the rows of `changes`, clipped to
+    [low, high] after every step. Exact for walks that overshoot at most
+    one of the bounds, which is shifted back by its largest overshoot.
+    """
+    path = start + np.cumsum(changes, axis=0)
+    below = np.minimum(path.min(axis=0) - low, 0)
+    above = np.maximum(path.max(axis=0) - high, 0)
+
+    return np.clip(path[-1] - below - above, low, high)
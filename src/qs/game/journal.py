@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import typing as t
+from datetime import datetime, timedelta
+
+from qs.contrib.msgspec import Struct, msgspec
+from qs.game.orders import OrderKind, RestingOrder
+
+if t.TYPE_CHECKING:
+    from qs.game.session import Session
+
+
+class Command(Struct, frozen=True, tag=True):
+    """
+    A mutation of a session, recorded after it has been applied so that
+    `apply` reproduces it on a rebuilt session. Player commands are also
+    what request handlers queue with `Session.submit`; `apply` returns the
+    result handed back to them.
+    """
+    def apply(self, session: Session) -> t.Any:
+        raise NotImplementedError
+
+
+class Join(Command, frozen=True):
+    username: str
+    is_leader: bool = False
+
+    def apply(self, session: Session) -> None:
+        session.add_player(self.username, is_leader=self.is_leader)
+
+
+class BuyStock(Command, frozen=True):
+    username: str
+    symbol: str
+    quantity: int
+
+    def apply(self, session: Session) -> None:
+        session.get_player(self.username).buy_stock(self.symbol, self.quantity)
+
+
+class SellStock(Command, frozen=True):
+    username: str
+    symbol: str
+    quantity: int
+
+    def apply(self, session: Session) -> None:
+        session.get_player(self.username).sell_stock(self.symbol, self.quantity)
+
+
+class LiquidateStock(Command, frozen=True):
+    username: str
+    symbol: str
+
+    def apply(self, session: Session) -> None:
+        session.get_player(self.username).liquidate_stock(self.symbol)
+
+
+class SetFoodBudget(Command, frozen=True):
+    username: str
+    amount: float
+
+    def apply(self, session: Session) -> None:
+        session.get_player(self.username).set_monthly_food_budget(self.amount)
+
+
+class SetLeisureBudget(Command, frozen=True):
+    username: str
+    amount: float
+
+    def apply(self, session: Session) -> None:
+        session.get_player(self.username).set_monthly_leisure_expense(
+            self.amount,
+        )
+
+
+class MoveAccommodation(Command, frozen=True):
+    username: str
+    accommodation_id: str
+    quality: str
+    location: str
+    sqm: float
+
+    def apply(self, session: Session) -> None:
+        from qs.game.player import HOUSING_QUALITY, LOCATION_TYPE
+
+        session.get_player(self.username).move_accommodation(
+            accommodation_id=self.accommodation_id,
+            quality=HOUSING_QUALITY[self.quality],
+            location=LOCATION_TYPE[self.location],
+            sqm=self.sqm,
+        )
+
+
+class PlaceOrder(Command, frozen=True):
+    username: str
+    symbol: str
+    kind: str
+    price: float
+    quantity: int
+
+    def apply(self, session: Session) -> RestingOrder:
+        return session.get_player(self.username).place_order(
+            symbol=self.symbol,
+            kind=OrderKind(self.kind),
+            price=self.price,
+            quantity=self.quantity,
+        )
+
+
+class CancelOrder(Command, frozen=True):
+    username: str
+    order_id: int
+
+    def apply(self, session: Session) -> RestingOrder:
+        return session.get_player(self.username).cancel_order(self.order_id)
+
+
+class SetTimeProgression(Command, frozen=True):
+    multiplier: int
+
+    def apply(self, session: Session) -> None:
+        session.set_time_progression_multiplier(self.multiplier)
+
+
+class Start(Command, frozen=True):
+    def apply(self, session: Session) -> None:
+        session.start()
+
+
+class Pause(Command, frozen=True):
+    def apply(self, session: Session) -> None:
+        session.pause()
+
+
+class Stop(Command, frozen=True):
+    def apply(self, session: Session) -> None:
+        session.stop()
+
+
+class Advance(Command, frozen=True):
+    hours: int
+
+    def apply(self, session: Session) -> None:
+        session.advance(self.hours)
+
+
+class AdvanceTo(Command, frozen=True):
+    time: datetime
+
+    def apply(self, session: Session) -> None:
+        session.advance_to(self.time)
+
+
+Entry = t.Union[
+    Join,
+    BuyStock,
+    SellStock,
+    LiquidateStock,
+    SetFoodBudget,
+    SetLeisureBudget,
+    MoveAccommodation,
+    PlaceOrder,
+    CancelOrder,
+    SetTimeProgression,
+    Start,
+    Pause,
+    Stop,
+    Advance,
+    AdvanceTo,
+]
+
+
+# commands whose effects live in engine rows
+ROW_COMMANDS = (
+    BuyStock,
+    SellStock,
+    LiquidateStock,
+    SetFoodBudget,
+    SetLeisureBudget,
+    MoveAccommodation,
+)
+
+# commands whose effects live in the session's order book
+ORDER_COMMANDS = (
+    PlaceOrder,
+    CancelOrder,
+)
+
+
+def push(entries: list[Command], command: Command) -> None:
+    """
+    Append `command`, merging it into a trailing `Advance`: advancing by a
+    and then b visits the same calendar points as advancing by a + b.
+    """
+    last = entries[-1] if entries else None
+
+    if isinstance(command, Advance) and isinstance(last, Advance):
+        entries[-1] = Advance(hours=last.hours + command.hours)
+    else:
+        entries.append(command)
+
+
+def encode_commands(commands: t.Sequence[Command]) -> bytes:
+    return msgspec.msgpack.encode(commands)
+
+
+def decode_commands(data: bytes) -> list[Command]:
+    return msgspec.msgpack.decode(data, type=list[Entry])
+
+
+class PlayerState(Struct, frozen=True):
+    username: str
+    is_leader: bool
+    occupation: str
+    accommodation_id: str
+
+
+class Snapshot(Struct, frozen=True):
+    """
+    Complete state of a session at `time`: the player attributes kept
+    outside the engine, the raw bytes of every allocated engine row and
+    the resting orders.
+    """
+    time: datetime
+    time_progression_multiplier: int
+    status: str
+    players: list[PlayerState]
+    columns: dict[str, bytes]
+    orders: list[RestingOrder] = []
+    next_order_id: int = 1
+
+
+class JournalState(Struct):
+    since: datetime
+    snapshot: Snapshot | None
+    entries: list[Entry]
+
+
+class Journal:
+    """
+    Per-session command log. Consecutive `Advance` commands are merged,
+    and once `max_entries` commands or `snapshot_interval` of simulated
+    time have accumulated the log is compacted into a `Snapshot`, so a
+    replay restores the snapshot and applies only the commands after it.
+    """
+    def __init__(
+        self,
+        start: datetime,
+        max_entries: int = 256,
+        snapshot_interval: timedelta = timedelta(days=30),
+    ):
+        self._since = start
+        self._max_entries = max_entries
+        self._snapshot_interval = snapshot_interval
+        self._snapshot: Snapshot | None = None
+        self._entries: list[Command] = []
+
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+    def get_snapshot(self) -> Snapshot | None:
+        return self._snapshot
+
+
+    def get_entries(self) -> tuple[Command, ...]:
+        return tuple(self._entries)
+
+
+    def record(self, session: Session, command: Command) -> None:
+        self.extend(session, (command,))
+
+
+    def extend(self, session: Session, commands: t.Iterable[Command]) -> None:
+        """
+        Append commands already applied to `session`, snapshotting it if
+        the log is due for compaction.
+        """
+        for command in commands:
+            push(self._entries, command)
+
+        if (
+            len(self._entries) >= self._max_entries
+            or session.get_time() - self._since >= self._snapshot_interval
+        ):
+            self.snapshot(session)
+
+
+    def snapshot(self, session: Session) -> None:
+        self._snapshot = session.dump_state()
+        self._since = self._snapshot.time
+        self._entries.clear()
+
+
+    def replay(self, session: Session) -> None:
+        """
+        Apply the snapshot and commands to a freshly created session.
+        Commands a worker skipped are skipped again.
+        """
+        if self._snapshot is not None:
+            session.load_state(self._snapshot)
+
+        session.apply(self._entries)
+
+
+    def encode(self) -> bytes:
+        return msgspec.msgpack.encode(
+            JournalState(
+                since=self._since,
+                snapshot=self._snapshot,
+                entries=self._entries,
+            )
+        )
+
+
+    @classmethod
+    def decode(cls, data: bytes) -> Journal:
+        state = msgspec.msgpack.decode(data, type=JournalState)
+
+        journal = cls(start=state.since)
+        journal._snapshot = state.snapshot
+        journal._entries = list(state.entries)
+
+        return journal
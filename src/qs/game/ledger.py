@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from enum import IntEnum
+
+import numpy as np
+
+
+class LineItem(IntEnum):
+    """
+    Categories of balance postings, in the column order of the engine's
+    `ledger`. Credits are positive and debits negative.
+    """
+    INTEREST = 0
+    TRANSPORTATION = 1
+    LEISURE = 2
+    DIVIDENDS = 3
+    SALARY = 4
+    RENT = 5
+    UTILITIES = 6
+    LOAN = 7
+    TAXES = 8
+    GROCERIES = 9
+    LIFE_EVENTS = 10
+
+
+def new_lines(players: int | None = None) -> np.ndarray:
+    """
+    Empty postings for one player, or a `(players, items)` block of them.
+    """
+    if players is None:
+        return np.zeros(len(LineItem))
+
+    return np.zeros((players, len(LineItem)))
+
+
+def summarize(lines: np.ndarray) -> dict[str, float]:
+    """
+    Totals of one player's ledger row by category name.
+    """
+    return {
+        item.name.lower(): float(lines[item])
+        for item in LineItem
+    }
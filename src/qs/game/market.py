@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import hashlib
+from datetime import date
+
+import numpy as np
+
+
+class Market:
+    """
+    Scenario price history as a dense `(days, symbols)` array indexed by
+    day offset from the first trading day. Non-trading days are forward
+    filled once at load time, days before a symbol's first quote take that
+    first quote, and offsets past the end clamp to the last day.
+
+    Dividends per share are kept in the same layout together with their
+    cumulative sums over days, so the total paid over any window of days
+    is the difference of two rows.
+    """
+    def __init__(
+        self,
+        stock_prices: dict[str, dict[date, float]],
+        dividends: dict[str, dict[date, float]] | None = None,
+        end_date: date | None = None,
+    ):
+        self._symbols = tuple(stock_prices.keys())
+        self._symbol_index = {
+            symbol: index
+            for index, symbol in enumerate(self._symbols)
+        }
+
+        first = min(
+            day
+            for prices in stock_prices.values()
+            for day in prices
+        )
+        last = max(
+            day
+            for prices in stock_prices.values()
+            for day in prices
+        )
+        if end_date is not None:
+            last = max(last, end_date)
+
+        self._origin = first.toordinal()
+        days = last.toordinal() - self._origin + 1
+
+        self._prices = np.empty((days, len(self._symbols)))
+
+        for column, symbol in enumerate(self._symbols):
+            prices = stock_prices[symbol]
+            known = np.full(days, np.nan)
+            for day, price in prices.items():
+                known[day.toordinal() - self._origin] = price
+
+            # forward fill, then back fill the days before the first quote
+            filled = np.flatnonzero(~np.isnan(known))
+            positions = np.searchsorted(filled, np.arange(days), "right") - 1
+            self._prices[:, column] = known[filled[np.maximum(positions, 0)]]
+
+        self._prices.flags.writeable = False
+
+        self._dividends = np.zeros((days, len(self._symbols)))
+
+        for column, symbol in enumerate(self._symbols):
+            for day, amount in (dividends or {}).get(symbol, {}).items():
+                offset = day.toordinal() - self._origin
+                if amount and 0 <= offset < days:
+                    self._dividends[offset, column] = amount
+
+        self._dividends.flags.writeable = False
+
+        # row i holds the dividends paid on offsets [0, i)
+        self._cumulative_dividends = np.zeros((days + 1, len(self._symbols)))
+        np.cumsum(self._dividends, axis=0, out=self._cumulative_dividends[1:])
+        self._cumulative_dividends.flags.writeable = False
+
+        self._dividend_offsets = tuple(
+            int(offset)
+            for offset in np.flatnonzero(self._dividends.any(axis=1))
+        )
+
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr((self._origin, self._symbols)).encode())
+        digest.update(self._prices.tobytes())
+        digest.update(self._dividends.tobytes())
+        self._digest = digest.hexdigest()
+
+
+    def get_symbols(self) -> tuple[str, ...]:
+        return self._symbols
+
+
+    def get_symbol_index(self, symbol: str) -> int:
+        return self._symbol_index[symbol]
+
+
+    def get_origin(self) -> date:
+        return date.fromordinal(self._origin)
+
+
+    def get_digest(self) -> str:
+        """
+        Hash of the symbols, prices and dividends, for keying caches of
+        results computed from them.
+        """
+        return self._digest
+
+
+    def __len__(self) -> int:
+        return len(self._prices)
+
+
+    def offset(self, day: date) -> int:
+        """
+        Row of the price array holding the prices for `day`.
+        """
+        return min(max(day.toordinal() - self._origin, 0), len(self._prices) - 1)
+
+
+    def offsets(self, days: np.ndarray) -> np.ndarray:
+        """
+        `offset` of each day ordinal in `days`.
+        """
+        return np.clip(days - self._origin, 0, len(self._prices) - 1)
+
+
+    def get_price(self, symbol: str, offset: int) -> float:
+        return float(self._prices[offset, self._symbol_index[symbol]])
+
+
+    def get_prices(self, offset: int) -> np.ndarray:
+        """
+        Prices of all symbols at the given offset, in symbol order.
+        """
+        return self._prices[offset]
+
+
+    def get_price_history(self) -> np.ndarray:
+        """
+        The full read-only `(days, symbols)` price array.
+        """
+        return self._prices
+
+
+    def get_dividend_dates(self) -> tuple[date, ...]:
+        """
+        Sorted days on which at least one symbol pays a dividend.
+        """
+        return tuple(
+            date.fromordinal(self._origin + offset)
+            for offset in self._dividend_offsets
+        )
+
+
+    def get_dividends(self, offset: int) -> np.ndarray:
+        """
+        Dividend per share of all symbols paid at the given offset.
+        """
+        return self._dividends[offset]
+
+
+    def get_dividend_history(self) -> np.ndarray:
+        """
+        The full read-only `(days, symbols)` dividend array.
+        """
+        return self._dividends
+
+
+    def get_dividends_between(self, start: int, end: int) -> np.ndarray:
+        """
+        Dividend per share of all symbols paid over offsets [start, end].
+        """
+        start = min(max(start, 0), len(self._prices))
+        end = min(max(end + 1, start), len(self._prices))
+        return self._cumulative_dividends[end] - self._cumulative_dividends[start]
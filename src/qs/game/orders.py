@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import bisect
+import typing as t
+from enum import StrEnum
+
+import numpy as np
+
+from qs.contrib.msgspec import Struct
+from qs.exceptions import BadRequestError, NotFoundError
+
+
+class OrderKind(StrEnum):
+    LIMIT = "limit"  # buy once the price falls to the level
+    STOP_LOSS = "stop_loss"  # sell once the price falls to the level
+    TAKE_PROFIT = "take_profit"  # sell once the price rises to the level
+
+
+# kinds triggered by the price falling to their level, the rest by it rising
+FALLING = (OrderKind.LIMIT, OrderKind.STOP_LOSS)
+
+
+class RestingOrder(Struct, frozen=True):
+    id: int
+    username: str
+    symbol: str
+    kind: OrderKind
+    price: float
+    quantity: int
+
+
+class OrderBook:
+    """
+    Resting orders of a session. Each symbol keeps two lists of
+    `(price, id)` sorted with `bisect`: orders that trigger when the price
+    falls to their level and orders that trigger when it rises to it. A
+    price change pops the crossed end of each list, so its cost depends on
+    the orders that fill, not on how many rest far from the price.
+
+    Prices are checked only when the day changes, so an order placed
+    beyond the current price fills at the next day's price if that one
+    still crosses it.
+    """
+    def __init__(self, symbols: t.Sequence[str]):
+        self._symbols = tuple(symbols)
+        self._orders: dict[int, RestingOrder] = {}
+        self._falling: list[list[tuple[float, int]]] = [[] for _ in symbols]
+        self._rising: list[list[tuple[float, int]]] = [[] for _ in symbols]
+        self._next_id = 1
+
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+
+    def get_orders(self, username: str | None = None) -> list[RestingOrder]:
+        return [
+            order
+            for order in self._orders.values()
+            if username is None or order.username == username
+        ]
+
+
+    def place(
+        self,
+        username: str,
+        symbol: str,
+        kind: OrderKind,
+        price: float,
+        quantity: int,
+    ) -> RestingOrder:
+        if symbol not in self._symbols:
+            raise BadRequestError(f"Unknown symbol '{symbol}'")
+        if quantity <= 0 or price <= 0:
+            raise BadRequestError("Order price and quantity must be positive")
+
+        order = RestingOrder(
+            id=self._next_id,
+            username=username,
+            symbol=symbol,
+            kind=kind,
+            price=price,
+            quantity=quantity,
+        )
+        self._next_id += 1
+        self._insert(order)
+
+        return order
+
+
+    def _insert(self, order: RestingOrder) -> None:
+        column = self._symbols.index(order.symbol)
+        levels = self._falling if order.kind in FALLING else self._rising
+
+        bisect.insort(levels[column], (order.price, order.id))
+        self._orders[order.id] = order
+
+
+    def cancel(self, username: str, order_id: int) -> RestingOrder:
+        order = self._orders.get(order_id)
+
+        if order is None or order.username != username:
+            raise NotFoundError(f"No resting order {order_id}")
+
+        column = self._symbols.index(order.symbol)
+        levels = self._falling if order.kind in FALLING else self._rising
+        entries = levels[column]
+
+        del entries[bisect.bisect_left(entries, (order.price, order.id))]
+        del self._orders[order_id]
+
+        return order
+
+
+    def trigger(self, prices: np.ndarray) -> list[RestingOrder]:
+        """
+        Remove and return the orders crossed by `prices`, oldest first.
+        """
+        if not self._orders:
+            return []
+
+        triggered: list[tuple[float, int]] = []
+
+        for column, price in enumerate(prices.tolist()):
+            falling = self._falling[column]
+            if falling and falling[-1][0] >= price:
+                index = bisect.bisect_left(falling, (price, 0))
+                triggered += falling[index:]
+                del falling[index:]
+
+            rising = self._rising[column]
+            if rising and rising[0][0] <= price:
+                index = bisect.bisect_right(rising, (price, self._next_id))
+                triggered += rising[:index]
+                del rising[:index]
+
+        return [
+            self._orders.pop(order_id)
+            for order_id in sorted(order_id for _, order_id in triggered)
+        ]
+
+
+    def next_trigger(self, prices: np.ndarray) -> int | None:
+        """
+        First row of the `(days, symbols)` price window on which any order
+        triggers. Only the highest falling and lowest rising level of each
+        symbol are compared, whatever the number of orders.
+        """
+        if not self._orders:
+            return None
+
+        rows = []
+
+        for column in range(len(self._symbols)):
+            falling = self._falling[column]
+            if falling:
+                crossed = prices[:, column] <= falling[-1][0]
+                if crossed.any():
+                    rows.append(int(crossed.argmax()))
+
+            rising = self._rising[column]
+            if rising:
+                crossed = prices[:, column] >= rising[0][0]
+                if crossed.any():
+                    rows.append(int(crossed.argmax()))
+
+        return min(rows, default=None)
+
+
+    def dump(self) -> tuple[list[RestingOrder], int]:
+        return list(self._orders.values()), self._next_id
+
+
+    def load(self, orders: t.Iterable[RestingOrder], next_id: int) -> None:
+        self._orders.clear()
+
+        for levels in self._falling + self._rising:
+            levels.clear()
+
+        for order in orders:
+            self._insert(order)
+
+        self._next_id = next_id
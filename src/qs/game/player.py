@@ -1,14 +1,27 @@
 from __future__ import annotations
 
+import time as clock
 import typing as t
+from contextlib import contextmanager
 from enum import StrEnum, Enum
-from datetime import timedelta
+from functools import wraps
 
-from qs.events_data import EVENTS_DF
+from qs.cache import CacheInfo
 from qs.exceptions import UnderflowError
-from qs.game.priceMultiplier import PriceMultiplier
+from qs.game import journal
+from qs.game import life_events
+from qs.game.calendar import LIFESTYLE_HOURS, MEAL_HOURS
+from qs.game.ledger import LineItem, new_lines, summarize
+from qs.game.orders import OrderKind, RestingOrder
+from qs.game.shocks import SHOCK_HAPPINESS, SHOCK_STRESS
 
 if t.TYPE_CHECKING:
+    from datetime import datetime
+
+    import numpy as np
+
+    from qs.events_data import EventResponse
+    from qs.game.engine import Engine
     from qs.game.session import Session
 
 
@@ -71,9 +84,264 @@ class LOCATION_TYPE(Enum):
     }
 
 
+FOOD_TYPES = tuple(FOOD_TYPE)
+HOUSING_QUALITIES = tuple(HOUSING_QUALITY)
+LOCATION_TYPES = tuple(LOCATION_TYPE)
+
+
+class Column:
+    """
+    Descriptor exposing one cell of an `Engine` column as an attribute.
+    The owner must provide `_engine` and `_row`.
+    """
+    __slots__ = ("_column",)
+
+    def __init__(self, column: str):
+        self._column = column
+
+
+    def __get__(self, obj, objtype=None) -> t.Any:
+        if obj is None:
+            return self
+
+        return float(getattr(obj._engine, self._column)[obj._row])
+
+
+    def __set__(self, obj, value: float) -> None:
+        getattr(obj._engine, self._column)[obj._row] = value
+
+
+class IntColumn(Column):
+    """
+    Descriptor exposing an `Engine` column of whole numbers as an int.
+    """
+    __slots__ = ()
+
+    def __get__(self, obj, objtype=None) -> t.Any:
+        if obj is None:
+            return self
+
+        return int(getattr(obj._engine, self._column)[obj._row])
+
+
+    def __set__(self, obj, value: float) -> None:
+        getattr(obj._engine, self._column)[obj._row] = int(value)
+
+
+class EnumColumn(Column):
+    """
+    Descriptor exposing an integer-coded `Engine` column as an enum member.
+    """
+    __slots__ = ("_members",)
+
+    def __init__(self, column: str, members: tuple[Enum, ...]):
+        super().__init__(column)
+        self._members = members
+
+
+    def __get__(self, obj, objtype=None) -> t.Any:
+        if obj is None:
+            return self
+
+        return self._members[getattr(obj._engine, self._column)[obj._row]]
+
+
+    def __set__(self, obj, value: Enum) -> None:
+        getattr(obj._engine, self._column)[obj._row] = \
+            self._members.index(value)
+
+
+class Positions(t.MutableMapping[str, t.Any]):
+    """
+    Dict-like view of one player's row in a per-symbol `Engine` matrix.
+    """
+    __slots__ = ("_engine", "_column", "_row", "_cast")
+
+    def __init__(self, engine: Engine, column: str, row: int, cast: type):
+        self._engine = engine
+        self._column = column
+        self._row = row
+        self._cast = cast
+
+
+    def _index(self, symbol: str) -> int:
+        return self._engine.get_symbol_index(symbol)
+
+
+    def __getitem__(self, symbol: str) -> t.Any:
+        matrix = getattr(self._engine, self._column)
+        return self._cast(matrix[self._row, self._index(symbol)])
+
+
+    def __setitem__(self, symbol: str, value: t.Any) -> None:
+        matrix = getattr(self._engine, self._column)
+        matrix[self._row, self._index(symbol)] = value
+
+
+    def __delitem__(self, symbol: str) -> None:
+        raise TypeError("Positions cannot be removed.")
+
+
+    def __iter__(self) -> t.Iterator[str]:
+        return iter(self._engine.get_symbols())
+
+
+    def __len__(self) -> int:
+        return len(self._engine.get_symbols())
+
+
+STATE = "state"
+PRICES = "prices"
+MULTIPLIER = "multiplier"
+
+DERIVED_INPUTS: dict[str, t.Callable[[Player], t.Any]] = {
+    STATE: lambda player: int(player._engine.revision[player._row]),
+    PRICES: lambda player: player._session.get_day(),
+    MULTIPLIER: lambda player: player._session.get_price_multiplier(),
+}
+
+DERIVED_GETTERS: list[str] = []
+
+
+def derived(*inputs: str):
+    """
+    Memoize a derived `Player` getter until one of its inputs changes:
+    `STATE` (trades, budgets, accommodation), `PRICES` (the session's price
+    day) or `MULTIPLIER` (the cost of living multiplier).
+    """
+    def decorator(method: t.Callable[[Player], float]) -> t.Callable[[Player], float]:
+        name = method.__name__
+        getters = tuple(DERIVED_INPUTS[input] for input in inputs)
+
+        @wraps(method)
+        def wrapper(self: Player) -> float:
+            stamp = tuple(getter(self) for getter in getters)
+            cached = self._derived.get(name)
+
+            if cached is not None and cached[0] == stamp:
+                self._derived_hits += 1
+                return cached[1]
+
+            self._derived_misses += 1
+            value = method(self)
+            self._derived[name] = (stamp, value)
+            return value
+
+        DERIVED_GETTERS.append(name)
+        return wrapper
+
+    return decorator
+
+
+class System(t.NamedTuple):
+    name: str
+    hours: tuple[int, ...]
+    days: tuple[int, ...] | None
+    posts: bool
+    run: t.Callable[..., None]
+
+
+class Slot(t.NamedTuple):
+    postings: tuple[t.Callable[[Player, datetime, np.ndarray], None], ...]
+    systems: tuple[t.Callable[[Player, datetime], None], ...]
+
+
+SYSTEMS: list[System] = []
+
+
+def system(
+    hours: tuple[int, ...],
+    days: tuple[int, ...] | None = None,
+    posts: bool = False,
+):
+    """
+    Register a `Player` method run by `tick` at the given hours of the given
+    days of the month (of every day by default). Systems that post are
+    passed the tick's line items to fill and run before the others, which
+    see the balance once the line items are applied.
+    """
+    def decorator(method: t.Callable[..., None]) -> t.Callable[..., None]:
+        SYSTEMS.append(System(method.__name__, hours, days, posts, method))
+        return method
+
+    return decorator
+
+
+def build_dispatch(systems: t.Sequence[System]) -> list[list[Slot]]:
+    """
+    Table of the systems due at each day of the month and hour of the
+    day, indexed by `[day - 1][hour]`.
+    """
+    return [
+        [
+            Slot(
+                postings=tuple(
+                    system.run
+                    for system in systems
+                    if system.posts and _is_due(system, day, hour)
+                ),
+                systems=tuple(
+                    system.run
+                    for system in systems
+                    if not system.posts and _is_due(system, day, hour)
+                ),
+            )
+            for hour in range(24)
+        ]
+        for day in range(1, 32)
+    ]
+
+
+def _is_due(system: System, day: int, hour: int) -> bool:
+    return hour in system.hours and (system.days is None or day in system.days)
+
+
+@contextmanager
+def timed_systems() -> t.Iterator[dict[str, float]]:
+    """
+    Accumulate the seconds spent in each system by `Player.tick` inside the
+    block, by system name.
+    """
+    global DISPATCH
+
+    timings = {system.name: 0.0 for system in SYSTEMS}
+
+    def timed(system: System) -> System:
+        def run(*args: t.Any) -> None:
+            start = clock.perf_counter()
+            system.run(*args)
+            timings[system.name] += clock.perf_counter() - start
+
+        return system._replace(run=run)
+
+    dispatch = DISPATCH
+    DISPATCH = build_dispatch([timed(system) for system in SYSTEMS])
+
+    try:
+        yield timings
+    finally:
+        DISPATCH = dispatch
+
+
 class UserLifestyle:
+    """
+    View over one player's lifestyle stats stored in an `Engine`.
+    """
+    __slots__ = ("_engine", "_row")
+
+    health = Column("health")
+    happiness = Column("happiness")
+    energy = Column("energy")
+    social_life = Column("social_life")
+    stress_level = Column("stress_level")
+    living_comfort = Column("living_comfort")
+    career_progress = Column("career_progress")
+    skills_education = Column("skills_education")
+
     def __init__(
         self,
+        engine: Engine,
+        row: int,
         health: float,
         happiness: float,
         energy: float,
@@ -83,6 +351,8 @@ class UserLifestyle:
         career_progress: float,
         skills_education: float,
     ):
+        self._engine = engine
+        self._row = row
         self.health = health
         self.happiness = happiness
         self.energy = energy
@@ -116,10 +386,13 @@ class UserLifestyle:
         housing_quality: HOUSING_QUALITY,
         housing_has_sauna: bool,
         events: list[str],
+        market_shock: float = 0.0,
     ) -> float:
         bonus = housing_quality.value["happiness"]
         sauna_bonus = 2 if housing_has_sauna else 0
-        event_bonus = 10 if 'salary_bonus' in events else 0
+        event_bonus = sum(
+            life_events.EVENT_HAPPINESS.get(event, 0) for event in events
+        ) - SHOCK_HAPPINESS * market_shock
         self.happiness += bonus + sauna_bonus + event_bonus + \
             BaseDecays.HAPPINESS.value + leisure_spent / 10
 
@@ -168,7 +441,7 @@ class UserLifestyle:
         savings: float,
         monthly_expenses: float,
         unsecured_debt: float,
-        crash_event_occurred: bool,
+        market_shock: float,
         stock_portfolio_performance: float,
         stock_exposure: float
     ) -> float:
@@ -181,8 +454,7 @@ class UserLifestyle:
         if unsecured_debt > 0:
             stress_change += unsecured_debt / 200
 
-        if crash_event_occurred:
-            stress_change += 15
+        stress_change += SHOCK_STRESS * market_shock
 
         stress_change += int(-stock_portfolio_performance *
                              stock_exposure / monthly_expenses)
@@ -252,6 +524,37 @@ def get_monthly_salary(occupation: Occupation) -> int:
 
 
 class Player:
+    """
+    A player in a session. Numeric state lives in the session's `Engine`,
+    the attributes below are views over this player's row; everything
+    shared by the whole process (price multipliers, events) is read through
+    the session.
+    """
+    __slots__ = (
+        "_session",
+        "_username",
+        "_is_leader",
+        "_engine",
+        "_row",
+        "_derived",
+        "_derived_hits",
+        "_derived_misses",
+        "_occupation",
+        "_stocks",
+        "_entry_prices",
+        "_accommodation_id",
+        "_lifestyle",
+        "_life_events_fired",
+    )
+
+    _balance = Column("balance")
+    _monthly_grocery_expense = Column("grocery_budget")
+    _monthly_leisure_expense = Column("leisure_budget")
+    _private_living_space_sqm = IntColumn("sqm")
+    _food_type = EnumColumn("food_type", FOOD_TYPES)
+    _housing_quality = EnumColumn("housing_quality", HOUSING_QUALITIES)
+    _location_type = EnumColumn("location_type", LOCATION_TYPES)
+
     def __init__(
         self,
         session: Session,
@@ -261,18 +564,21 @@ class Player:
         self._session = session
         self._username = username
         self._is_leader = is_leader
+        self._engine = session.get_engine()
+        self._row = self._engine.allocate()
+        self._derived: dict[str, tuple[tuple, float]] = {}
+        self._derived_hits = 0
+        self._derived_misses = 0
         self._balance = 15000.0
         self._occupation = Occupation.SOFTWARE_ENGINEER
+        self._engine.salary[self._row] = get_monthly_salary(self._occupation)
+        self._schedule_life_events()
         self._monthly_grocery_expense = 300.0
         self._monthly_leisure_expense = 250.0
-        self._stocks: dict[str, int] = {
-            symbol: 0
-            for symbol in session.get_stock_prices().keys()
-        }
-        self._entry_prices: dict[str, float] = {
-            symbol: 0.0
-            for symbol in session.get_stock_prices().keys()
-        }
+        self._stocks = Positions(self._engine, "holdings", self._row, int)
+        self._entry_prices = Positions(
+            self._engine, "entry_prices", self._row, float,
+        )
 
         self._food_type = FOOD_TYPE.HOME_COOKED
         self._housing_quality = HOUSING_QUALITY.MEDIUM
@@ -280,6 +586,8 @@ class Player:
         self._private_living_space_sqm = 50
         self._accommodation_id = "default_medium_suburbs_50"
         self._lifestyle = UserLifestyle(
+            engine=self._engine,
+            row=self._row,
             health=100,
             happiness=100,
             energy=100,
@@ -289,15 +597,44 @@ class Player:
             career_progress=0,
             skills_education=0,
         )
-        self._events = []
-        self._priceMultiplier = PriceMultiplier()
-        self._multiplier = 1
+
+    def _schedule_life_events(self) -> None:
+        """Sample the player's life events for the rest of the scenario."""
+        _, end = self._session.get_period()
+        days, events, postings = life_events.sample(
+            self._session.get_life_event_rng(self._username),
+            start=self._session.get_time().date(),
+            end=end.date(),
+            salary=float(self._engine.salary[self._row]),
+        )
+
+        self._engine.schedule_life_events(self._row, days, events, postings)
+        self._life_events_fired = 0
+
+    @property
+    def _multiplier(self) -> float:
+        return self._session.get_price_multiplier()
+
+    def _touch(self) -> None:
+        """Invalidate derived values that depend on the player's state."""
+        self._engine.revision[self._row] += 1
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(
+            hits=self._derived_hits,
+            misses=self._derived_misses,
+            maxsize=len(DERIVED_GETTERS),
+            currsize=len(self._derived),
+        )
 
     def get_session(self) -> Session:
         return self._session
 
-    def get_events(self) -> list[dict]:
-        return self._events
+    def get_row(self) -> int:
+        return self._row
+
+    def get_events(self) -> tuple[EventResponse, ...]:
+        return self._session.get_events()
 
     def get_username(self) -> str:
         return self._username
@@ -316,19 +653,31 @@ class Player:
 
         return assets
 
+    @derived(STATE, PRICES)
     def get_stock_portfolio_value(self) -> float:
-        return sum(
-            self._session.get_stock_price(symbol) * size
-            for symbol, size in self._stocks.items()
-        )
+        prices = self._session.get_current_stock_prices()
+        return float(prices @ self._engine.holdings[self._row])
 
     def get_equity(self) -> float:
         stocks = self.get_stock_portfolio_value()
         return self._balance + stocks
 
+    def get_portfolio_performance(self) -> float:
+        """Return of the current holdings over the performance window."""
+        value = self._engine.stock_value[self._row]
+        window_value = self._engine.window_value[self._row]
+
+        return float(value / window_value - 1) if window_value > 0 else 0.0
+
+    def get_stock_exposure(self) -> float:
+        """Value of the holdings at the current price day's prices."""
+        return float(self._engine.stock_value[self._row])
+
+    @derived(STATE, PRICES)
     def get_monthly_income(self) -> float:
         return self.get_monthly_salary() + self.get_monthly_dividends()
 
+    @derived(STATE, MULTIPLIER)
     def get_monthly_expenses(self) -> float:
         return (
             self.get_monthly_rent_expense() +
@@ -340,13 +689,21 @@ class Player:
             self.get_monthly_tax_expense()
         )
 
+    @derived(STATE, PRICES, MULTIPLIER)
     def get_monthly_net_income(self) -> float:
         return self.get_monthly_income() - self.get_monthly_expenses()
 
     def get_occupation(self) -> Occupation:
         return self._occupation
 
-    def get_monthly_salary(self) -> float:
+    def is_employed(self) -> bool:
+        return bool(self._engine.employed[self._row])
+
+    def get_monthly_salary(self) -> int:
+        """The monthly salary, 0 while out of work."""
+        if not self.is_employed():
+            return 0
+
         return get_monthly_salary(self._occupation)
 
     def get_health_level(self) -> int:
@@ -373,9 +730,11 @@ class Player:
     def get_skills_education_level(self) -> int:
         return round(self._lifestyle.skills_education)
 
+    @derived(STATE, MULTIPLIER)
     def get_monthly_rent_expense(self) -> float:
         return (self._housing_quality.value["cost"] + self._location_type.value["cost"]) * self._multiplier
 
+    @derived(STATE, MULTIPLIER)
     def get_monthly_utilities_expense(self) -> float:
         # Base utilities of 100, plus 2 per sqm
         return (100 + (self._private_living_space_sqm * 2)) * self._multiplier
@@ -384,7 +743,13 @@ class Player:
         return self._food_type.value["cost"]
 
     def set_monthly_grocery_expense(self, amount: float) -> None:
+        # unchanged budgets keep the derived caches, `_classify_food`
+        # writes the same amount back every day
+        if amount == self._monthly_grocery_expense:
+            return
+
         self._monthly_grocery_expense = amount
+        self._touch()
 
     def get_monthly_transportation_expense(self) -> float:
         return 150 * self._multiplier
@@ -394,10 +759,13 @@ class Player:
 
     def set_monthly_leisure_expense(self, amount: float) -> None:
         self._monthly_leisure_expense = amount
+        self._touch()
+        self._session.record(journal.SetLeisureBudget(self._username, amount))
 
     def set_monthly_food_budget(self, amount: float) -> None:
         """Set the monthly food budget and adjust food type accordingly."""
         self._monthly_grocery_expense = amount
+        self._touch()
 
         # Adjust food type based on budget
         if amount / self._multiplier >= 250:
@@ -407,6 +775,8 @@ class Player:
         else:
             self._food_type = FOOD_TYPE.FAST_FOOD
 
+        self._session.record(journal.SetFoodBudget(self._username, amount))
+
     def get_accommodation_id(self) -> str:
         """Get the current accommodation ID."""
         return self._accommodation_id
@@ -434,6 +804,16 @@ class Player:
         self._housing_quality = quality
         self._location_type = location
         self._private_living_space_sqm = sqm
+        self._touch()
+        self._session.record(
+            journal.MoveAccommodation(
+                username=self._username,
+                accommodation_id=accommodation_id,
+                quality=quality.name,
+                location=location.name,
+                sqm=sqm,
+            )
+        )
 
     def get_monthly_loan_expense(self) -> float:
         return 400
@@ -449,132 +829,171 @@ class Player:
         """Debit the player's balance."""
         self._balance -= amount
 
+    def get_ledger(self) -> dict[str, float]:
+        """Running totals of the player's postings by line item."""
+        return summarize(self._engine.ledger[self._row])
+
+    def _post(self, lines: np.ndarray) -> None:
+        """Apply a set of line items to the balance as one net movement."""
+        self._balance += float(lines.sum())
+        self._engine.ledger[self._row] += lines
+
+    def _post_line(self, item: LineItem, amount: float) -> None:
+        self._balance += amount
+        self._engine.ledger[self._row, item] += amount
+
+    @system(hours=(0,), posts=True)
+    def _post_daily(self, time: datetime, lines: np.ndarray) -> None:
+        if self._balance < 0:
+            # on a negative balance, incur daily interest 40% APR
+            lines[LineItem.INTEREST] = self._balance * (0.4 / 365)
+
+        lines[LineItem.TRANSPORTATION] = \
+            -(self.get_monthly_transportation_expense() * 12 / 365)
+        lines[LineItem.LEISURE] = -(self.get_monthly_leisure_expense() * 12 / 365)
+
+    @system(hours=(0,), posts=True)
+    def _post_dividends(self, time: datetime, lines: np.ndarray) -> None:
+        if self._session.get_calendar().has_dividends(time.date()):
+            lines[LineItem.DIVIDENDS] = self.get_dividends()
+
+    @system(hours=(0,), days=(1,), posts=True)
+    def _post_monthly(self, time: datetime, lines: np.ndarray) -> None:
+        lines[LineItem.SALARY] = self.get_monthly_salary()
+        lines[LineItem.RENT] = -self.get_monthly_rent_expense()
+        lines[LineItem.UTILITIES] = -self.get_monthly_utilities_expense()
+        lines[LineItem.LOAN] = -self.get_monthly_loan_expense()
+        lines[LineItem.TAXES] = -self.get_monthly_tax_expense()
+
+    @system(hours=MEAL_HOURS, posts=True)
+    def _post_meal(self, time: datetime, lines: np.ndarray) -> None:
+        lines[LineItem.GROCERIES] = \
+            -(self.get_monthly_grocery_expense() * 4 / 365)
+
+    @system(hours=(0,), posts=True)
+    def _post_life_events(self, time: datetime, lines: np.ndarray) -> None:
+        engine = self._engine
+        cursor = int(engine.life_event_cursor[self._row])
+        today = time.toordinal()
+
+        while engine.life_event_days[cursor] <= today:
+            event = int(engine.life_events[cursor])
+            lines[LineItem.LIFE_EVENTS] += engine.life_event_postings[cursor]
+            self._life_events_fired |= event
+
+            if event & life_events.LifeEvent.JOB_LOSS:
+                engine.employed[self._row] = 0
+                self._touch()
+            elif event & life_events.LifeEvent.REHIRE:
+                engine.employed[self._row] = 1
+                self._touch()
+
+            cursor += 1
+
+        engine.life_event_cursor[self._row] = cursor
+
+    @system(hours=(0,))
+    def _classify_food(self, time: datetime) -> None:
+        # needed to reclassify
+        self.set_monthly_grocery_expense(self._monthly_grocery_expense)
+
     def receive_salary(self) -> None:
         """Receive the monthly salary."""
-        self.credit(self.get_monthly_salary())
+        self._post_line(LineItem.SALARY, self.get_monthly_salary())
 
     def buy_meal(self) -> None:
         """Buy a meal. Players eat three times a day."""
         expense = self.get_monthly_grocery_expense() * 4 / 365
-        self.debit(expense)
+        self._post_line(LineItem.GROCERIES, -expense)
 
     def pay_daily_transportation(self) -> None:
         """Pay for daily transportation."""
         expense = self.get_monthly_transportation_expense() * 12 / 365
-        self.debit(expense)
+        self._post_line(LineItem.TRANSPORTATION, -expense)
 
     def pay_daily_leisure(self) -> None:
         """Pay for daily leisure."""
         expense = self.get_monthly_leisure_expense() * 12 / 365
-        self.debit(expense)
+        self._post_line(LineItem.LEISURE, -expense)
 
     def pay_taxes(self) -> None:
         """Pay the monthly tax expense."""
-        self.debit(self.get_monthly_tax_expense())
+        self._post_line(LineItem.TAXES, -self.get_monthly_tax_expense())
 
     def pay_rent(self) -> None:
         """Pay the monthly rent expense."""
-        self.debit(self.get_monthly_rent_expense())
+        self._post_line(LineItem.RENT, -self.get_monthly_rent_expense())
 
     def pay_utilities(self) -> None:
         """Pay the monthly utilities expense."""
-        self.debit(self.get_monthly_utilities_expense())
+        self._post_line(LineItem.UTILITIES, -self.get_monthly_utilities_expense())
 
     def pay_loan_installment(self) -> None:
         """Pay the monthly loan installment."""
-        self.debit(self.get_monthly_loan_expense())
-
-    def get_events_for_date(self) -> None:
-        session_time = self._session.get_time()
-
-        """Retrieve events for a specific date."""
-        events = EVENTS_DF[EVENTS_DF['Date'] ==
-                           f"{session_time.month:02d}-{session_time.day:02d}-{session_time.year:04d}"]
-
-        if not events.empty:
-            self._events = [
-                {
-                    "id": row['ID'],
-                    "date": row['Date'],
-                    "title": row['Event Title'],
-                    "description": row['Description']
-                }
-                for _, row in events.iterrows()
-            ]
-        else:
-            self._events = []
+        self._post_line(LineItem.LOAN, -self.get_monthly_loan_expense())
 
     def tick(self) -> None:
+        """
+        Run the systems due at the session's time. The line items of the
+        posting systems are applied to the balance in a single `_post`.
+        """
         time = self._session.get_time()
-
-        self.get_events_for_date()
-
-        self._multiplier = self._priceMultiplier.multiplier_for_month(
-            time.year, time.month)
-
-        if time.hour == 0:
-            if self.get_balance() < 0:
-                # on a negative balance, incur daily interest 40% APR
-                interest = -self.get_balance() * (0.4 / 365)
-                self.debit(interest)
-
-            self.pay_daily_transportation()
-            self.pay_daily_leisure()
-            self.receive_dividends()
-            # needed to reclassify
-            self.set_monthly_grocery_expense(
-                self._monthly_grocery_expense)
-
-        if time.day == 1 and time.hour == 0:
-            self.receive_salary()
-            self.pay_rent()
-            self.pay_utilities()
-            self.pay_loan_installment()
-            self.pay_taxes()
-
-        if time.hour in (6, 12, 18):
-            self.buy_meal()
-
-        if time.hour in (0, 6, 12, 18):
-            self._lifestyle.update_health(
-                food_type=self._food_type,
-                leisure_spent=self.get_monthly_leisure_expense() / self._multiplier,
-                current_month=time.month
-            )
-            self._lifestyle.update_happiness(
-                leisure_spent=self.get_monthly_leisure_expense() / self._multiplier / 30,
-                housing_quality=self._housing_quality,
-                housing_has_sauna=False,
-                events=[]
-            )
-            self._lifestyle.update_energy(
-                work_hours_per_week=32,
-                month=time.month
-            )
-            self._lifestyle.update_social_life(
-                leisure_spent=self.get_monthly_leisure_expense() / self._multiplier / 30,
-                work_hours_per_week=40
-            )
-            self._lifestyle.update_stress_level(
-                savings=self._balance,
-                monthly_expenses=self.get_monthly_expenses(),
-                unsecured_debt=0,
-                crash_event_occurred=False,
-                stock_portfolio_performance=0.0,
-                stock_exposure=0.0
-            )
-            self._lifestyle.update_living_comfort(
-                housing_quality=self._housing_quality,
-                location_type=self._location_type,
-                private_living_space_sqm=self._private_living_space_sqm
-            )
-            self._lifestyle.update_career_progress(
-                is_employed=True,
-                leisure_spent=self.get_monthly_leisure_expense() / self._multiplier / 30
-            )
-            self._lifestyle.update_skills_education(
-                education_hours_per_week=2
-            )
+        slot = DISPATCH[time.day - 1][time.hour]
+
+        if slot.postings:
+            lines = new_lines()
+            for run in slot.postings:
+                run(self, time, lines)
+            self._post(lines)
+
+        for run in slot.systems:
+            run(self, time)
+
+    @system(hours=LIFESTYLE_HOURS)
+    def _update_lifestyle(self, time: datetime) -> None:
+        market_shock = self._session.get_market_shock()
+        events = life_events.names(self._life_events_fired)
+        self._life_events_fired = 0
+        self._lifestyle.update_health(
+            food_type=self._food_type,
+            leisure_spent=self.get_monthly_leisure_expense() / self._multiplier,
+            current_month=time.month
+        )
+        self._lifestyle.update_happiness(
+            leisure_spent=self.get_monthly_leisure_expense() / self._multiplier / 30,
+            housing_quality=self._housing_quality,
+            housing_has_sauna=False,
+            events=events,
+            market_shock=market_shock
+        )
+        self._lifestyle.update_energy(
+            work_hours_per_week=32,
+            month=time.month
+        )
+        self._lifestyle.update_social_life(
+            leisure_spent=self.get_monthly_leisure_expense() / self._multiplier / 30,
+            work_hours_per_week=40
+        )
+        self._lifestyle.update_stress_level(
+            savings=self._balance,
+            monthly_expenses=self.get_monthly_expenses(),
+            unsecured_debt=0,
+            market_shock=market_shock,
+            stock_portfolio_performance=self.get_portfolio_performance(),
+            stock_exposure=self.get_stock_exposure()
+        )
+        self._lifestyle.update_living_comfort(
+            housing_quality=self._housing_quality,
+            location_type=self._location_type,
+            private_living_space_sqm=self._private_living_space_sqm
+        )
+        self._lifestyle.update_career_progress(
+            is_employed=self.is_employed(),
+            leisure_spent=self.get_monthly_leisure_expense() / self._multiplier / 30
+        )
+        self._lifestyle.update_skills_education(
+            education_hours_per_week=2
+        )
 
     def get_position_size(self, symbol: str) -> int:
         return self._stocks.get(symbol, 0)
@@ -589,6 +1008,10 @@ class Player:
         return (current_price - entry_price) * size
 
     def buy_stock(self, symbol: str, quantity: int) -> None:
+        self._buy(symbol, quantity)
+        self._session.record(journal.BuyStock(self._username, symbol, quantity))
+
+    def _buy(self, symbol: str, quantity: int) -> None:
         last_price = self._session.get_stock_price(symbol)
         expense = last_price * quantity
 
@@ -604,8 +1027,14 @@ class Player:
         self.debit(expense)
         self._stocks[symbol] += quantity
         self._entry_prices[symbol] = entry_price_after
+        self._touch()
+        self._session.mark_to_market(self._row)
 
     def sell_stock(self, symbol: str, quantity: int) -> None:
+        self._sell(symbol, quantity)
+        self._session.record(journal.SellStock(self._username, symbol, quantity))
+
+    def _sell(self, symbol: str, quantity: int) -> None:
         size_before = self._stocks.get(symbol, 0)
         size_after = size_before - quantity
 
@@ -628,6 +1057,8 @@ class Player:
         self.credit(revenue)
         self._stocks[symbol] -= quantity
         self._entry_prices[symbol] = entry_price_after
+        self._touch()
+        self._session.mark_to_market(self._row)
 
     def liquidate_stock(self, symbol: str) -> None:
         size = self._stocks.get(symbol, 0)
@@ -636,37 +1067,81 @@ class Player:
         self.credit(revenue)
         self._stocks[symbol] = 0
         self._entry_prices[symbol] = 0.0
+        self._touch()
+        self._session.mark_to_market(self._row)
+        self._session.record(journal.LiquidateStock(self._username, symbol))
 
-    def get_monthly_dividends(self) -> float:
-        dividends_data = self._session.get_dividends()
-        current_date = self._session.get_time().date()
-        total_dividends = 0.0
-
-        for symbol, size in self._stocks.items():
-            daily_dividends = dividends_data.get(symbol, {})
-            it = current_date - timedelta(days=29)
-            while it <= current_date:
-                dividend_per_share = daily_dividends.get(it, 0.0)
-                total_dividends += dividend_per_share * size
-                it += timedelta(days=1)
+    def get_orders(self) -> list[RestingOrder]:
+        return self._session.get_order_book().get_orders(self._username)
 
-        return total_dividends
+    def place_order(
+        self,
+        symbol: str,
+        kind: OrderKind,
+        price: float,
+        quantity: int,
+    ) -> RestingOrder:
+        """Rest an order that fills once the day's price reaches `price`."""
+        order = self._session.get_order_book().place(
+            username=self._username,
+            symbol=symbol,
+            kind=kind,
+            price=price,
+            quantity=quantity,
+        )
+        self._session.record(
+            journal.PlaceOrder(self._username, symbol, kind.value, price, quantity),
+        )
+        return order
+
+    def cancel_order(self, order_id: int) -> RestingOrder:
+        order = self._session.get_order_book().cancel(self._username, order_id)
+        self._session.record(journal.CancelOrder(self._username, order_id))
+        return order
+
+    def fill_order(self, order: RestingOrder) -> None:
+        """
+        Execute a triggered order at the day's price. Fills are not
+        journaled, since replaying the clock triggers them again. Sells are
+        cut down to the shares still held.
+        """
+        if order.kind == OrderKind.LIMIT:
+            self._buy(order.symbol, order.quantity)
+            return
+
+        quantity = min(order.quantity, self.get_position_size(order.symbol))
+        if quantity > 0:
+            self._sell(order.symbol, quantity)
+
+    @derived(STATE, PRICES)
+    def get_monthly_dividends(self) -> float:
+        dividends = self._session.get_trailing_dividends(days=30)
+        return float(dividends @ self._engine.holdings[self._row])
 
     def get_dividends(self) -> float:
-        dividends_data = self._session.get_dividends()
-        current_date = self._session.get_time().date()
+        dividends = self._session.get_current_dividends()
         total_dividends = 0.0
 
-        for symbol, size in self._stocks.items():
-            daily_dividends = dividends_data.get(symbol, {})
-            dividend_per_share = daily_dividends.get(current_date, 0.0)
-            total_dividends += dividend_per_share * size
+        for index, size in enumerate(self._engine.holdings[self._row]):
+            total_dividends += dividends[index] * size
 
-        return total_dividends
+        return float(total_dividends)
 
     def receive_dividends(self) -> None:
-        dividends = self.get_dividends()
-        self.credit(dividends)
+        self._post_line(LineItem.DIVIDENDS, self.get_dividends())
+
+    def dump_state(self) -> journal.PlayerState:
+        """State kept outside the engine, for session snapshots."""
+        return journal.PlayerState(
+            username=self._username,
+            is_leader=self._is_leader,
+            occupation=self._occupation.value,
+            accommodation_id=self._accommodation_id,
+        )
+
+    def load_state(self, state: journal.PlayerState) -> None:
+        self._occupation = Occupation(state.occupation)
+        self._accommodation_id = state.accommodation_id
 
     def dump_player_data(self) -> dict:
         return {
@@ -676,8 +1151,8 @@ class Player:
             "occupation": self._occupation.value,
             "monthly_grocery_expense": self._monthly_grocery_expense,
             "monthly_leisure_expense": self._monthly_leisure_expense,
-            "stocks": self._stocks,
-            "entry_prices": self._entry_prices,
+            "stocks": dict(self._stocks),
+            "entry_prices": dict(self._entry_prices),
             "food_type": self._food_type.name,
             "housing_quality": self._housing_quality.name,
             "location_type": self._location_type.name,
@@ -694,3 +1169,6 @@ class Player:
                 "skills_education": self._lifestyle.skills_education,
             },
         }
+
+
+DISPATCH = build_dispatch(SYSTEMS)
@@ -1,16 +1,71 @@
-import pandas as pd
+from __future__ import annotations
+
+import calendar
+from datetime import date
 from pathlib import Path
 
+import pandas as pd
+
 
 class PriceMultiplier:
-    def __init__(self):
+    """
+    Immutable month-indexed cost of living table. Load it once per process
+    with `PriceMultiplier.shared()`; lookups are a single list index.
+    """
+    __slots__ = ("_base_year", "_multipliers")
+
+    def __init__(self, base_year: int, multipliers: tuple[float, ...]):
+        self._base_year = base_year
+        self._multipliers = multipliers
+
+
+    @classmethod
+    def load(cls) -> PriceMultiplier:
         # Get the path to the CSV file
         csv_path = Path(__file__).parent.parent / \
             'resources' / 'finland_cost_of_living.csv'
-        self.df = pd.read_csv(csv_path)
+        df = pd.read_csv(csv_path)
+
+        months = [
+            (int(month[:4]), int(month[5:]))
+            for month in df['Month']
+        ]
+        base_year, base_month = months[0]
+
+        if base_month != 1 or months != [
+            (base_year + index // 12, index % 12 + 1)
+            for index in range(len(months))
+        ]:
+            raise ValueError("Cost of living data must be contiguous months")
+
         # Use the first entry as base value
-        self.base_value = self.df['Point figure'].iloc[0]
-        self.multiplier = 1
+        points = df['Point figure'].tolist()
+        base_value = points[0]
+
+        return cls(
+            base_year=base_year,
+            multipliers=tuple(point / base_value for point in points),
+        )
+
+
+    @classmethod
+    def shared(cls) -> PriceMultiplier:
+        global _shared
+
+        if _shared is None:
+            _shared = cls.load()
+
+        return _shared
+
+
+    def _index(self, year: int, month: int) -> int:
+        index = (year - self._base_year) * 12 + month - 1
+
+        if not 0 <= index < len(self._multipliers) or not 1 <= month <= 12:
+            raise ValueError(f"No data found for {year}-{month:02d}")
+
+        return index
+
 
     def multiplier_for_month(self, year: int, month: int) -> float:
         """
@@ -23,19 +78,24 @@ class PriceMultiplier:
         Returns:
             float: Price multiplier (1.0 = base value, >1.0 = more expensive, <1.0 = cheaper)
         """
-        # Format the month string to match CSV format (e.g., "2005M01")
-        month_str = f"{year}M{month:02d}"
+        return self._multipliers[self._index(year, month)]
 
-        # Find the row matching the given month
-        row = self.df[self.df['Month'] == month_str]
 
-        if row.empty:
-            raise ValueError(f"No data found for {year}-{month:02d}")
+    def multiplier_for_day(self, day: date) -> float:
+        """
+        Price multiplier linearly interpolated between the figure of the
+        day's month (taken on the 1st) and the next month's figure, so prices
+        drift daily instead of jumping at month boundaries.
+        """
+        index = self._index(day.year, day.month)
+        current = self._multipliers[index]
+
+        if index + 1 == len(self._multipliers):
+            return current
 
-        # Get the point figure for this month
-        point_figure = row['Point figure'].iloc[0]
+        following = self._multipliers[index + 1]
+        days = calendar.monthrange(day.year, day.month)[1]
+        return current + (following - current) * (day.day - 1) / days
 
-        # Calculate multiplier: ratio of current value to base value
-        multiplier = point_figure / self.base_value
 
-        return multiplier
+_shared: PriceMultiplier | None = None
@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import typing as t
+
+if t.TYPE_CHECKING:
+    from qs.game.session import Session
+
+
+class Scheduler:
+    """
+    Process-wide timer wheel driving every running session.
+
+    The wall-clock second is divided into `slots`; each session is placed in
+    the least loaded slot and advanced once per second when the wheel turns
+    past it, so the work of many sessions is spread evenly across the second
+    by a single task. Paused and stopped sessions are simply taken off the
+    wheel, and the task exits once the wheel is empty.
+
+    Turns are scheduled against monotonic deadlines, and each session is
+    advanced by the wall-clock time that actually passed since its last
+    turn rather than by a fixed second, so slow turns do not slow the game
+    down. A session owed more than `catch_up` seconds catches up over
+    several turns; whatever exceeds `max_backlog` is dropped and counted in
+    its lag until the backlog is caught up.
+
+    Simulation may use `budget` seconds of CPU per wall-clock second,
+    shared equally by the sessions on the wheel. A session's share is
+    converted to simulated hours with the measured cost of its recent
+    hours and run in slices of at most `time_slice` seconds, yielding to
+    the event loop in between. Sessions too fast for their share run
+    behind and eventually drop time, so their effective speed falls below
+    the multiplier asked for instead of stalling everything else.
+
+    Commands queued with `Session.submit` are applied before every slice,
+    so they never land in the middle of an advance.
+    """
+    def __init__(
+        self,
+        slots: int = 10,
+        catch_up: float = 2.0,
+        max_backlog: float = 10.0,
+        budget: float = 0.5,
+        time_slice: float = 0.02,
+    ):
+        self._slots: list[dict[Session, None]] = [{} for _ in range(slots)]
+        self._slot_of: dict[Session, int] = {}
+        self._pacing: dict[Session, Pacing] = {}
+        self._cursor = 0
+        self._catch_up = catch_up
+        self._max_backlog = max_backlog
+        self._budget = budget
+        self._time_slice = time_slice
+        self._task: asyncio.Task | None = None
+
+
+    @classmethod
+    def shared(cls, **kwargs: t.Any) -> Scheduler:
+        """
+        The process-wide scheduler, created with `kwargs` on first use.
+        """
+        global _shared
+
+        if _shared is None:
+            _shared = cls(**kwargs)
+
+        return _shared
+
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+
+    def __contains__(self, session: Session) -> bool:
+        return session in self._slot_of
+
+
+    def add(self, session: Session) -> None:
+        if session in self._slot_of:
+            return
+
+        index = min(
+            range(len(self._slots)),
+            key=lambda index: len(self._slots[index]),
+        )
+        self._slots[index][session] = None
+        self._slot_of[session] = index
+        self._pacing[session] = Pacing(time.monotonic())
+
+        self._ensure_running()
+
+
+    def remove(self, session: Session) -> None:
+        index = self._slot_of.pop(session, None)
+
+        if index is not None:
+            del self._slots[index][session]
+            del self._pacing[session]
+
+
+    def get_lag(self, session: Session) -> float:
+        """
+        Wall-clock seconds of play the session is behind, counting both the
+        backlog still to catch up and the time dropped from it since it
+        last caught up.
+        """
+        pacing = self._pacing.get(session)
+
+        if pacing is None:
+            return 0.0
+
+        return pacing.backlog + pacing.dropped
+
+
+    def get_speed(self, session: Session) -> float:
+        """
+        Simulated hours per wall-clock second the session actually ran at
+        over its recent turns.
+        """
+        pacing = self._pacing.get(session)
+        return 0.0 if pacing is None else pacing.speed
+
+
+    def _ensure_running(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        if (
+            self._task is None
+            or self._task.done()
+            or self._task.get_loop() is not loop
+        ):
+            self._task = loop.create_task(self._run())
+
+
+    async def _turn(self) -> None:
+        """
+        Advance the sessions of the slot under the cursor by the time owed
+        to each of them, within their share of the budget, and move the
+        cursor on.
+        """
+        slot = list(self._slots[self._cursor])
+        self._cursor = (self._cursor + 1) % len(self._slots)
+
+        for session in slot:
+            if session not in self._slot_of:
+                continue
+
+            pacing = self._pacing[session]
+            multiplier = session.get_time_progression_multiplier()
+            now = time.monotonic()
+            elapsed = now - pacing.last
+
+            pacing.backlog += elapsed
+            pacing.last = now
+
+            if pacing.backlog > self._max_backlog:
+                pacing.dropped += pacing.backlog - self._max_backlog
+                pacing.backlog = self._max_backlog
+
+            # at least one hour, so the cost of an hour keeps being measured
+            share = self._budget / len(self._slot_of) / pacing.cost
+            seconds = min(
+                pacing.backlog,
+                self._catch_up,
+                max(share, 1) / max(multiplier, 1),
+            )
+            pacing.backlog -= seconds
+
+            # caught up, so the time dropped before is no longer behind
+            if pacing.backlog <= 0:
+                pacing.dropped = 0.0
+
+            ran = await self._run_sliced(session, pacing, seconds, multiplier)
+            pacing.measure_speed(ran * multiplier, elapsed)
+
+
+    async def _run_sliced(
+        self,
+        session: Session,
+        pacing: Pacing,
+        seconds: float,
+        multiplier: int,
+    ) -> float:
+        """
+        Run `seconds` of play of the session in slices, yielding after each.
+        Returns the seconds actually run, which is less if the session is
+        taken off the wheel meanwhile.
+        """
+        ran = 0.0
+
+        while ran < seconds and session in self._slot_of:
+            hours = max(self._time_slice / pacing.cost, 1)
+            step = min(seconds - ran, hours / max(multiplier, 1))
+            session.drain()
+            started = time.perf_counter()
+
+            try:
+                running = session.run_seconds(step)
+            except Exception:
+                logging.exception(f"Session '{session.get_id()}' failed.")
+                running = False
+
+            pacing.measure_cost(step * multiplier, time.perf_counter() - started)
+            ran += step
+
+            if not running:
+                session.stop()
+
+            await asyncio.sleep(0)
+
+        return ran
+
+
+    async def _run(self) -> None:
+        interval = 1 / len(self._slots)
+        deadline = time.monotonic()
+
+        while self._slot_of:
+            await self._turn()
+
+            # never queue up missed turns, the pacing already covers them
+            deadline = max(deadline + interval, time.monotonic())
+            await asyncio.sleep(deadline - time.monotonic())
+
+
+class Pacing:
+    """
+    Wall-clock bookkeeping of one scheduled session. `cost` (CPU seconds
+    per simulated hour) and `speed` (simulated hours per wall-clock second)
+    are moving averages over its turns.
+    """
+    __slots__ = ("last", "backlog", "dropped", "cost", "speed")
+
+    smoothing = 0.3
+
+    def __init__(self, last: float):
+        self.last = last
+        self.backlog = 0.0
+        self.dropped = 0.0
+        self.cost = 1e-4  # pessimistic until the first hours are measured
+        self.speed = 0.0
+
+
+    def measure_cost(self, hours: float, cost: float) -> None:
+        if hours >= 1:
+            self.cost += self.smoothing * (cost / hours - self.cost)
+
+
+    def measure_speed(self, hours: float, elapsed: float) -> None:
+        if elapsed > 0:
+            self.speed += self.smoothing * (hours / elapsed - self.speed)
+
+
+_shared: Scheduler | None = None
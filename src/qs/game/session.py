@@ -1,17 +1,45 @@
 from __future__ import annotations
 
 import asyncio
+import itertools
+import logging
+import typing as t
+import zlib
 from datetime import datetime, date, timedelta
 from enum import StrEnum
 
+import numpy as np
+
+from qs.cache import CacheInfo
+from qs.events_data import EVENT_INDEX, EventResponse
+from qs.game.backtest import Scenario
+from qs.game.calendar import Action, Calendar, Resolution
+from qs.game import journal
+from qs.game.engine import PERFORMANCE_WINDOW, Engine
+from qs.game.journal import Journal
+from qs.game.life_events import rng_for
+from qs.game.market import Market
+from qs.game.orders import OrderBook
 from qs.game.player import Player
+from qs.game.priceMultiplier import PriceMultiplier
+from qs.game.scheduler import Scheduler
+from qs.game.shocks import compile_shocks
+from qs.game.workers import WorkerPool
 from qs.exceptions import (
+    Error,
     PlayerNotFoundError,
     PlayerAlreadyExistsError,
 )
 from qs.game.stocks import get_stock_prices
 
 
+SCENARIO_2008 = (
+    datetime(2008, 1, 1, 12, 0, 0),
+    datetime(2010, 12, 31, 12, 0, 0),
+)
+SCENARIO_2008_SYMBOLS = ("AAPL", "GOOGL", "MSFT", "AMZN")
+
+
 class SessionStatus(StrEnum):
     WAITING = "waiting"
     RUNNING = "running"
@@ -25,36 +53,114 @@ class Session:
         period: tuple[datetime, datetime],
         stock_prices: dict[str, dict[date, float]],
         dividends: dict[str, dict[date, float]],
+        vectorized: bool = True,
+        interpolated_prices: bool = False,
+        resolution: Resolution = Resolution.HOURLY,
+        seed: int | None = None,
     ):
+        # coarse resolutions only exist as `Engine.fast_forward` batches
+        if not vectorized and Resolution(resolution) != Resolution.HOURLY:
+            raise ValueError(
+                f"Sessions that are not vectorized only run hourly, "
+                f"not {resolution}."
+            )
+
         self._id = session_id
         self._players: dict[str, Player] = {}
+        self._period = period
         self._time, self._end_time = period
         self._stock_prices = stock_prices
         self._dividends = dividends
         self._time_progression_multiplier = 1
-        self._task: asyncio.Task | None = None
+        self._status = SessionStatus.WAITING
+        self._scheduler: Scheduler | None = None
+        self._owed_hours = 0.0
+        self._market = Market(
+            stock_prices,
+            dividends,
+            end_date=self._end_time.date(),
+        )
+        self._day = self._market.offset(self._time.date())
+        self._scenario = Scenario(period, self._market)
+        self._shocks = compile_shocks(self._scenario)
+        self._engine = Engine(symbols=self._market.get_symbols())
+        self._order_book = OrderBook(self._market.get_symbols())
+        self._vectorized = vectorized
+        self._price_multiplier = PriceMultiplier.shared()
+        self._interpolated_prices = interpolated_prices
+        self._resolution = Resolution(resolution)
+        self._seed = zlib.crc32(session_id.encode()) if seed is None else seed
+        self._multiplier = 1
+        self._multiplier_key: date | tuple[int, int] | None = None
+        self._events: tuple[EventResponse, ...] = ()
+        self._events_date: date | None = None
+        self._calendar = Calendar(
+            period=period,
+            dividend_dates=self._market.get_dividend_dates(),
+            event_dates=EVENT_INDEX.get_dates(),
+        )
+        self._journal = Journal(start=self._time)
+        self._journal_listeners: list[t.Callable[[Session], None]] = []
+        self._replaying = False
+        self._workers: WorkerPool | None = None
+        self._outbox: list[journal.Command] = []
+        self._in_flight: list[journal.Command] | None = None
+        self._mailbox: list[tuple[journal.Command, asyncio.Future[t.Any]]] = []
+        self._draining: asyncio.Handle | None = None
 
 
     @classmethod
-    async def create_scenario_2008(cls, session_id: str) -> Session:
-        start_time = datetime(2008, 1, 1, 12, 0, 0)
-        end_time = datetime(2010, 12, 31, 12, 0, 0)
-
+    async def create_scenario_2008(
+        cls,
+        session_id: str,
+        vectorized: bool = True,
+        interpolated_prices: bool = False,
+        resolution: Resolution = Resolution.HOURLY,
+        seed: int | None = None,
+    ) -> Session:
         stock_prices, dividends = await get_stock_prices(
-            symbols=("AAPL", "GOOGL", "MSFT", "AMZN"),
-            period=(start_time, end_time),
+            symbols=SCENARIO_2008_SYMBOLS,
+            period=SCENARIO_2008,
         )
 
         return cls(
             session_id=session_id,
-            period=(start_time, end_time),
+            period=SCENARIO_2008,
             stock_prices=stock_prices,
             dividends=dividends,
+            vectorized=vectorized,
+            interpolated_prices=interpolated_prices,
+            resolution=resolution,
+            seed=seed,
         )
 
 
     def get_id(self) -> str:
         return self._id
+
+
+    def get_engine(self) -> Engine:
+        return self._engine
+
+
+    def is_vectorized(self) -> bool:
+        return self._vectorized
+
+
+    def get_seed(self) -> int:
+        return self._seed
+
+
+    def get_life_event_rng(self, username: str) -> np.random.Generator:
+        """
+        Generator a player's life events are sampled from when joining.
+        Equal for equal seeds, so replays sample the same events.
+        """
+        return rng_for(self._seed, username)
+
+
+    def get_resolution(self) -> Resolution:
+        return self._resolution
     
 
     def get_players(self) -> list[Player]:
@@ -78,90 +184,739 @@ class Session:
         username: str,
         is_leader: bool = False,
     ) -> Player:
-        player = Player(
-            session=self,
-            username=username,
-            is_leader=is_leader,
-        )
-
         if username in self._players:
             raise PlayerAlreadyExistsError(
                 session_id=self._id,
                 username=username,
             )
 
+        player = Player(
+            session=self,
+            username=username,
+            is_leader=is_leader,
+        )
+
         self._players[username] = player
+        self.record(journal.Join(username, is_leader))
 
         return player
     
 
+    def cache_info(self) -> CacheInfo:
+        """
+        Hits and misses of the derived getter caches, summed over players.
+        """
+        infos = [player.cache_info() for player in self._players.values()]
+
+        return CacheInfo(
+            hits=sum(info["hits"] for info in infos),
+            misses=sum(info["misses"] for info in infos),
+            maxsize=sum(info["maxsize"] for info in infos),
+            currsize=sum(info["currsize"] for info in infos),
+        )
+    
+
     def get_time(self) -> datetime:
         return self._time
     
 
+    def get_period(self) -> tuple[datetime, datetime]:
+        return self._period
+    
+
     def get_time_progression_multiplier(self) -> int:
         return self._time_progression_multiplier
     
 
     def set_time_progression_multiplier(self, multiplier: int) -> None:
         self._time_progression_multiplier = multiplier
+        self.record(journal.SetTimeProgression(multiplier))
+
+        if not multiplier and self._scheduler is not None:
+            self._scheduler.remove(self)
+        else:
+            self.resume()
+
+
+    def get_price_multiplier(self) -> float:
+        return self._multiplier
+
+
+    def get_day(self) -> int:
+        """
+        Offset of the current simulated date into the market arrays.
+        """
+        return self._day
+
+
+    def get_events(self) -> tuple[EventResponse, ...]:
+        return self._events
+
+
+    def get_calendar(self) -> Calendar:
+        return self._calendar
+
+
+    def get_journal(self) -> Journal:
+        return self._journal
+
+
+    def watch_journal(self, listener: t.Callable[[Session], None]) -> None:
+        """
+        Call `listener` with the session whenever commands are added to its
+        journal, to persist it.
+        """
+        self._journal_listeners.append(listener)
+
+
+    def _journaled(self) -> None:
+        for listener in self._journal_listeners:
+            listener(self)
+
+
+    def record(self, command: journal.Command) -> None:
+        """
+        Append an applied command to the session journal, or send it to
+        the session's worker when simulation runs in a `WorkerPool`.
+        """
+        if self._replaying:
+            return
+
+        if self._workers is None:
+            self._journal.record(self, command)
+            self._journaled()
+            return
+
+        journal.push(self._outbox, command)
+        self._flush()
+
+
+    def submit(self, command: journal.Command) -> asyncio.Future[t.Any]:
+        """
+        Queue a player command. Queued commands are applied in order, in
+        one batch, at the next tick boundary: before the scheduler runs the
+        session's next time slice, or as soon as the event loop is free if
+        that comes first. The future resolves to the command's result, or
+        its error, once applied at the session's time then.
+        """
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[t.Any] = loop.create_future()
+        self._mailbox.append((command, future))
+
+        if self._draining is None:
+            self._draining = loop.call_soon(self.drain)
+
+        return future
+
+
+    def drain(self) -> None:
+        """
+        Apply the queued commands whose submitters are still waiting.
+        """
+        if self._draining is not None:
+            self._draining.cancel()
+            self._draining = None
+
+        mailbox, self._mailbox = self._mailbox, []
+
+        for command, future in mailbox:
+            if future.cancelled():
+                continue
+
+            try:
+                result = command.apply(self)
+            except Exception as exc:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+
+    def apply(
+        self,
+        commands: t.Iterable[journal.Command],
+    ) -> list[journal.Command]:
+        """
+        Apply commands recorded by another copy of this session, without
+        journaling or scheduling anything. Commands the other copy raced
+        past, such as selling shares a resting order has sold meanwhile,
+        are logged and skipped; returns the skipped commands.
+        """
+        skipped: list[journal.Command] = []
+        self._replaying = True
+
+        try:
+            for command in commands:
+                try:
+                    command.apply(self)
+                except Error as exc:
+                    logging.warning(
+                        f"Session '{self._id}' skipped {command!r}: {exc!r}",
+                    )
+                    skipped.append(command)
+        finally:
+            self._replaying = False
+
+        return skipped
+
+
+    def attach(self, workers: WorkerPool) -> None:
+        """
+        Move simulation of this session into a worker process. Commands
+        still apply locally so handlers see their effects at once, while
+        advancing happens only in the worker; each answer replaces the
+        engine rows and the clock, and commands issued in the meantime are
+        applied again on top.
+        """
+        workers.open(
+            session_id=self._id,
+            period=self._period,
+            stock_prices=self._stock_prices,
+            dividends=self._dividends,
+            vectorized=self._vectorized,
+            interpolated_prices=self._interpolated_prices,
+            resolution=self._resolution,
+            seed=self._seed,
+            log=self._journal,
+        )
+
+        self._workers = workers
+
+
+    def _flush(self) -> None:
+        if self._workers is None or self._in_flight is not None:
+            return
+
+        if not self._outbox:
+            return
+
+        batch, self._outbox = self._outbox, []
+        self._in_flight = batch
+
+        future = self._workers.apply(self._id, batch)
+        future.add_done_callback(self._synced)
+
+
+    def _synced(self, future: asyncio.Future[journal.Snapshot]) -> None:
+        batch, self._in_flight = self._in_flight or [], None
+
+        try:
+            snapshot = future.result()
+        except Exception:
+            logging.exception(f"Session '{self._id}' failed in its worker.")
+
+            # only the advances of the batch were never applied here
+            self._workers = None
+            self._outbox = batch + self._outbox
+            self._detach()
+            self.stop()
+            return
+
+        self._engine.load_columns(snapshot.columns)
+        self._order_book.load(snapshot.orders, snapshot.next_order_id)
+        self._set_time(snapshot.time)
+        self._journal.extend(self, batch)
+        self._journaled()
+
+        skipped = self.apply(
+            command
+            for command in self._outbox
+            if isinstance(
+                command,
+                journal.ROW_COMMANDS + journal.ORDER_COMMANDS,
+            )
+        )
+
+        # commands no longer valid on top of the worker's state are dropped,
+        # so that neither the worker nor the journal sees them
+        if skipped:
+            self._outbox = [
+                command
+                for command in self._outbox
+                if not any(command is other for other in skipped)
+            ]
+
+        if snapshot.status == SessionStatus.ENDED:
+            self._detach()
+            self._end_if_over()
+            return
+
+        self._flush()
+
+
+    def _detach(self) -> None:
+        if self._workers is not None:
+            self._workers.close(self._id)
+
+        self._workers = None
+        self._journal.extend(
+            self,
+            (
+                command
+                for command in self._outbox
+                if not isinstance(command, (journal.Advance, journal.AdvanceTo))
+            ),
+        )
+        self._outbox = []
+        self._journaled()
+
+
+    def replay(self, log: Journal) -> None:
+        """
+        Rebuild a freshly created session from `log`, which then becomes
+        its journal. Running sessions are left off the scheduler until
+        `resume` is called.
+        """
+        self._replaying = True
+
+        try:
+            log.replay(self)
+        finally:
+            self._replaying = False
+
+        self._journal = log
+
+
+    def dump_state(self) -> journal.Snapshot:
+        orders, next_order_id = self._order_book.dump()
+
+        return journal.Snapshot(
+            time=self._time,
+            time_progression_multiplier=self._time_progression_multiplier,
+            status=self._status.value,
+            players=[
+                player.dump_state()
+                for player in self._players.values()
+            ],
+            columns=self._engine.dump_columns(),
+            orders=orders,
+            next_order_id=next_order_id,
+        )
+
+
+    def load_state(self, snapshot: journal.Snapshot) -> None:
+        for state in snapshot.players:
+            player = self.add_player(state.username, is_leader=state.is_leader)
+            player.load_state(state)
+
+        self._engine.load_columns(snapshot.columns)
+        self._order_book.load(snapshot.orders, snapshot.next_order_id)
+        self._time_progression_multiplier = snapshot.time_progression_multiplier
+        self._status = SessionStatus(snapshot.status)
+        self._set_time(snapshot.time)
+
+
+    def _set_time(self, time: datetime) -> None:
+        self._time = time
+
+        if time.date() != self._events_date:
+            self._events_date = time.date()
+            self._events = EVENT_INDEX.on(self._events_date)
+            self._day = self._market.offset(self._events_date)
+            self.mark_to_market()
+
+        key = self._multiplier_key_for(time)
+        if key != self._multiplier_key:
+            self._multiplier_key = key
+            self._multiplier = self._multiplier_for(time)
+
+
+    def mark_to_market(self, row: int | None = None) -> None:
+        """
+        Revalue the holdings of one engine row, or of all of them, for the
+        rolling portfolio performance of the current day.
+        """
+        history = self._market.get_price_history()
+
+        self._engine.mark_to_market(
+            history[self._day],
+            history[max(self._day - PERFORMANCE_WINDOW, 0)],
+            row,
+        )
+
+
+    def get_market_shock(self) -> float:
+        """
+        Market shock felt at each lifestyle update of the current day.
+        """
+        return float(self._shocks[self._day])
+
+
+    def _multiplier_for(self, time: datetime) -> float:
+        if self._interpolated_prices:
+            return self._price_multiplier.multiplier_for_day(time.date())
+
+        return self._price_multiplier.multiplier_for_month(
+            time.year, time.month)
+
+
+    def _multiplier_key_for(self, time: datetime) -> date | tuple[int, int]:
+        """
+        Key identifying the period over which the price multiplier stays
+        constant: a day in interpolated mode, a month otherwise.
+        """
+        if self._interpolated_prices:
+            return time.date()
+
+        return (time.year, time.month)
+
+
+    def _step(self, actions: Action) -> None:
+        if not self._vectorized:
+            for player in self._players.values():
+                player.tick()
+
+            return
+
+        dividends = None
+        if actions & Action.DIVIDEND:
+            dividends = self._market.get_dividends(self._day)
+
+        self._engine.step(
+            actions=actions,
+            month=self._time.month,
+            multiplier=self._multiplier,
+            dividends=dividends,
+            shock=self._shocks[self._day],
+            day=self._time.toordinal(),
+        )
+
+
+    def advance(self, hours: int) -> None:
+        """
+        Advance the clock by `hours`, jumping straight between the action
+        points of the session calendar. Equivalent to `hours` calls to
+        `tick`, but idle hours cost nothing.
+        """
+        if self._workers is not None:
+            self.record(journal.Advance(hours))
+            return
+
+        self._advance(hours)
+        self.record(journal.Advance(hours))
+        self._end_if_over()
+
+
+    def _advance(self, hours: int) -> None:
+        target = min(self._time + timedelta(hours=hours), self._end_time)
+
+        if target <= self._time:
+            return
+
+        if self._resolution != Resolution.HOURLY:
+            self._resolve(target)
+            return
+
+        for time, actions in self._calendar.between(self._time, target):
+            day = self._day
+            self._set_time(time)
+
+            if self._day != day:
+                self._fill_orders()
+
+            self._step(actions)
+
+        self._set_time(target)
+
+
+    def _resolve(self, target: datetime) -> None:
+        """
+        Advance the clock to `target`, applying the actions of every period
+        of the session's resolution that ends by then in one batch each; the
+        last, partial period is applied once the scenario ends. Resting
+        orders are checked against the last day of each batch.
+        """
+        start, _ = self._period
+        hour = timedelta(hours=1)
+        resolved = max(start, self._resolution.floor(self._time))
+        boundary = self._resolution.floor(target)
+
+        if target >= self._end_time:
+            boundary = target + hour
+
+        if boundary > resolved:
+            batches = self.fast_forward(
+                self._engine, resolved - hour, boundary - hour,
+            )
+
+            for time in batches:
+                self._set_time(max(time, self._time))
+                self._fill_orders()
+
+        self._set_time(target)
+
+
+    def _fill_orders(self) -> None:
+        """
+        Fill the resting orders crossed by the day's prices. Runs when the
+        day changes, before the first calendar action of the new day.
+        """
+        prices = self._market.get_prices(self._day)
+
+        for order in self._order_book.trigger(prices):
+            self._players[order.username].fill_order(order)
+
+
+    def advance_to(self, target: datetime) -> None:
+        """
+        Fast-forward the session to `target`. Vectorized sessions process
+        the calendar actions of each month (each day with interpolated
+        prices) in a single `Engine.fast_forward` batch; the result matches
+        ticking hour by hour up to floating point rounding.
+        """
+        target = min(
+            target.replace(minute=0, second=0, microsecond=0),
+            self._end_time,
+        )
+
+        if target <= self._time:
+            return
+
+        if self._workers is not None:
+            self.record(journal.AdvanceTo(target))
+            return
+
+        if self._vectorized and self._resolution == Resolution.HOURLY:
+            self._fast_forward(target)
+        else:
+            self._advance((target - self._time) // timedelta(hours=1))
+
+        self.record(journal.AdvanceTo(target))
+        self._end_if_over()
+
+
+    def _fast_forward(self, target: datetime) -> None:
+        # batches cannot fill orders, so stop short of every day on which
+        # one triggers and step through its first hour
+        while (trigger := self._next_trigger(target)) is not None:
+            self._fast_forward_batches(trigger - timedelta(hours=1))
+            self._advance(1)
+
+        self._fast_forward_batches(target)
+
+
+    def _fast_forward_batches(self, target: datetime) -> None:
+        for time in self.fast_forward(self._engine, self._time, target):
+            self._set_time(time)
+
+        self._set_time(max(target, self._time))
+
+
+    def _next_trigger(self, target: datetime) -> datetime | None:
+        """
+        Midnight of the first day up to `target` on which a resting order
+        triggers.
+        """
+        if not self._order_book:
+            return None
+
+        tomorrow = self._time.date() + timedelta(days=1)
+        first = self._market.offset(tomorrow)
+        last = self._market.offset(target.date())
+
+        if tomorrow > target.date():
+            return None
+
+        row = self._order_book.next_trigger(
+            self._market.get_price_history()[first:last + 1],
+        )
+        if row is None:
+            return None
+
+        day = date.fromordinal(
+            self._market.get_origin().toordinal() + first + row,
+        )
+        midnight = datetime.combine(max(day, tomorrow), datetime.min.time())
+
+        return midnight if midnight <= target else None
+
+
+    def fast_forward(
+        self,
+        engine: Engine,
+        start: datetime,
+        end: datetime,
+    ) -> t.Iterator[datetime]:
+        """
+        Run the calendar actions in (start, end] on `engine`, which may be
+        the session's engine or a scratch copy of some of its rows, in one
+        `Engine.fast_forward` batch per month (per day with interpolated
+        prices or a daily resolution). Yields the time of the last action of
+        each batch once it has been applied; the session itself is left
+        untouched.
+
+        Sessions with a daily or monthly resolution use the closed-form
+        batches, and monthly ones apply the price multiplier of a month's
+        first day to all of it. A daily batch costs about as much as
+        stepping through its day, so only monthly ones are much faster.
+        """
+        symbols = engine.get_symbols()
+        points = self._calendar.between(start, end)
+        batches = itertools.groupby(
+            points,
+            key=lambda point: self._batch_key_for(point[0]),
+        )
+
+        for _, group in batches:
+            batch = list(group)
+            first, _ = batch[0]
+
+            days = np.array([time.toordinal() for time, _ in batch])
+            offsets = self._market.offsets(days)
+            history = self._market.get_price_history()
+
+            dividends = np.zeros((len(batch), len(symbols)))
+            for index, (_, actions) in enumerate(batch):
+                if actions & Action.DIVIDEND:
+                    dividends[index] = self._market.get_dividends(
+                        offsets[index],
+                    )
+
+            engine.fast_forward(
+                actions=[actions for _, actions in batch],
+                month=first.month,
+                multiplier=self._multiplier_for(first),
+                dividends=dividends,
+                prices=history[offsets],
+                window_prices=history[np.maximum(offsets - PERFORMANCE_WINDOW, 0)],
+                shocks=self._shocks[offsets],
+                days=days,
+                exact=self._resolution == Resolution.HOURLY,
+            )
+
+            yield batch[-1][0]
+
+
+    def _batch_key_for(self, time: datetime) -> date | tuple[int, int]:
+        if self._resolution == Resolution.DAILY:
+            return time.date()
+        if self._resolution == Resolution.MONTHLY:
+            return (time.year, time.month)
+
+        return self._multiplier_key_for(time)
 
 
     def tick(self) -> None:
-        self._time += timedelta(hours=1)
+        self.advance(1)
+
+
+    def run_seconds(self, seconds: float) -> bool:
+        """
+        Advance by `seconds` of wall-clock play, carrying fractions of an
+        hour over to the next call. Called by the scheduler; returns whether
+        the session is still running afterwards.
+        """
+        self._owed_hours += seconds * self._time_progression_multiplier
+        hours = int(self._owed_hours)
+        self._owed_hours -= hours
+
+        if hours:
+            self.advance(hours)
+
+        return self._status == SessionStatus.RUNNING
+
+
+    def get_lag(self) -> float:
+        """
+        Wall-clock seconds the session has fallen behind its pace.
+        """
+        if self._scheduler is None:
+            return 0.0
+
+        return self._scheduler.get_lag(self)
+
+
+    def get_effective_speed(self) -> float:
+        """
+        Simulated hours per second the session really runs at, which falls
+        below the time progression multiplier when the server is busy.
+        """
+        if self._scheduler is None:
+            return 0.0
+
+        return self._scheduler.get_speed(self)
 
-        for player in self._players.values():
-            player.tick()
+
+    def _end_if_over(self) -> None:
+        """
+        End the session once its clock reaches the end of the period,
+        whether it was started or not.
+        """
+        if self._time >= self._end_time and self._status != SessionStatus.ENDED:
+            self._end()
 
 
     def start(self) -> None:
-        if self._task is not None:
+        if self._status != SessionStatus.WAITING:
             return
 
-        async def run():
-            while self._time < self._end_time:
-                for _ in range(self._time_progression_multiplier):
-                    self.tick()
+        self._status = SessionStatus.RUNNING
+        self.record(journal.Start())
+        self.resume()
 
-                await asyncio.sleep(1)
 
-        loop = asyncio.get_running_loop()
-        self._task = loop.create_task(run())
+    def resume(self) -> None:
+        """
+        Put a running session on the process scheduler.
+        """
+        if (
+            self._replaying
+            or self._status != SessionStatus.RUNNING
+            or not self._time_progression_multiplier
+        ):
+            return
+
+        self._scheduler = Scheduler.shared()
+        self._scheduler.add(self)
 
 
     def pause(self) -> None:
         self._time_progression_multiplier = 0
+        self.record(journal.Pause())
+
+        if self._scheduler is not None:
+            self._scheduler.remove(self)
 
     
     def stop(self) -> None:
-        if self._task is None:
+        if self._status != SessionStatus.RUNNING:
             return
 
-        self._task.cancel()
+        self._end()
+
+
+    def _end(self) -> None:
+        if self._scheduler is not None:
+            self._scheduler.remove(self)
+
+        self._status = SessionStatus.ENDED
+        self.record(journal.Stop())
 
 
     def get_status(self) -> SessionStatus:
-        if self._task is None:
-            return SessionStatus.WAITING
+        return self._status
+
+
+    def get_market(self) -> Market:
+        return self._market
+
 
-        if self._task.done():
-            return SessionStatus.ENDED
+    def get_scenario(self) -> Scenario:
+        return self._scenario
 
-        return SessionStatus.RUNNING
+
+    def get_order_book(self) -> OrderBook:
+        return self._order_book
 
 
     def get_stock_price(self, symbol: str) -> float:
-        prices = self._stock_prices[symbol]
-        current_date = self._time.date()
-        first_date = min(prices.keys())
+        return self._market.get_price(symbol, self._day)
 
-        while current_date >= first_date:
-            if current_date in prices:
-                return prices[current_date]
-            
-            current_date -= timedelta(days=1)
 
-        return prices[first_date]
+    def get_current_stock_prices(self) -> np.ndarray:
+        """
+        Current prices of all symbols, in `Market.get_symbols()` order.
+        """
+        return self._market.get_prices(self._day)
     
 
     def get_stock_prices(self) -> dict[str, dict[date, float]]:
@@ -169,11 +924,33 @@ class Session:
 
 
     def get_dividend(self, symbol: str) -> float:
-        try:
-            return self._dividends[symbol][self._time.date()]
-        except:
+        if not self._calendar.has_dividends(self._time.date()):
             return 0.0
 
+        index = self._market.get_symbol_index(symbol)
+        return float(self._market.get_dividends(self._day)[index])
+
+
+    def get_current_dividends(self) -> np.ndarray:
+        """
+        Dividends per share paid today for all symbols, in symbol order.
+        """
+        if not self._calendar.has_dividends(self._time.date()):
+            return np.zeros(len(self._market.get_symbols()))
+
+        return self._market.get_dividends(self._day)
+
+
+    def get_trailing_dividends(self, days: int = 30) -> np.ndarray:
+        """
+        Dividends per share paid over the last `days` days including today,
+        for all symbols.
+        """
+        return self._market.get_dividends_between(
+            self._day - days + 1,
+            self._day,
+        )
+
 
     def get_dividends(self) -> dict[str, dict[date, float]]:
         return self._dividends
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import re
+import typing as t
+from datetime import date, datetime
+from enum import IntFlag
+
+import numpy as np
+
+from qs.cache import lru_cache
+from qs.events_data import EVENT_INDEX
+from qs.game.calendar import LIFESTYLE_HOURS
+
+if t.TYPE_CHECKING:
+    from qs.game.backtest import Scenario
+
+
+# stress and happiness change of a full day's market shock
+SHOCK_STRESS = 15
+SHOCK_HAPPINESS = 10
+
+# shock of each drawdown threshold crossed since the last peak
+DRAWDOWN_THRESHOLDS = (0.1, 0.2, 0.3, 0.4, 0.5)
+DRAWDOWN_SHOCK = 0.5
+
+
+class Category(IntFlag):
+    """
+    Kinds of historical events, tagged from their titles.
+    """
+    CRASH = 1
+    FAILURE = 2
+    CRISIS = 4
+    RESCUE = 8
+
+
+CATEGORY_PATTERNS = {
+    Category.CRASH: re.compile(
+        r"crash|plunge|drop|lowest|bottom|correction|volatility", re.I,
+    ),
+    Category.FAILURE: re.compile(
+        r"bankruptcy|failure|collapse|default|seizure|liquidat|\brun\b", re.I,
+    ),
+    Category.CRISIS: re.compile(
+        r"crisis|recession|depression|write-down|downgrade|unemployment|"
+        r"concern|foreclosure|decline|rejected",
+        re.I,
+    ),
+    Category.RESCUE: re.compile(
+        r"bailout|rate cut|cuts|stabilization|injection|recovery|rally|"
+        r"\bqe",
+        re.I,
+    ),
+}
+
+# shock of an event of each category, in order of precedence; relief is
+# negative
+CATEGORY_SHOCKS = {
+    Category.CRASH: 1.0,
+    Category.FAILURE: 0.75,
+    Category.CRISIS: 0.5,
+    Category.RESCUE: -0.25,
+}
+
+
+def tag(title: str) -> Category:
+    """
+    Categories of an event by its title.
+    """
+    categories = Category(0)
+
+    for category, pattern in CATEGORY_PATTERNS.items():
+        if pattern.search(title):
+            categories |= category
+
+    return categories
+
+
+def event_shock(categories: Category) -> float:
+    """
+    Shock of an event, that of its category with the highest precedence.
+    """
+    for category, shock in CATEGORY_SHOCKS.items():
+        if categories & category:
+            return shock
+
+    return 0.0
+
+
+def compile_shocks(scenario: Scenario) -> np.ndarray:
+    """
+    Market shock of every day of the scenario's market, indexed by day
+    offset like its prices and spread over the day's lifestyle updates.
+
+    A day's shock is that of its events plus `DRAWDOWN_SHOCK` for every
+    threshold the equally weighted index of the symbols crosses that day
+    for the first time since its last peak, clipped to [-1, 1]. Schedules
+    are cached by the scenario and the digest of its market data.
+    """
+    return _compile_shocks(scenario, scenario.get_market().get_digest())
+
+
+@lru_cache(maxsize=64)
+def _compile_shocks(scenario: Scenario, digest: str) -> np.ndarray:
+    market = scenario.get_market()
+    history = market.get_price_history()
+    origin = market.get_origin()
+    shocks = np.zeros(len(market))
+
+    last = date.fromordinal(origin.toordinal() + len(market) - 1)
+    for event in EVENT_INDEX.between(origin, last):
+        day = market.offset(datetime.strptime(event.date, "%m-%d-%Y").date())
+        shocks[day] += event_shock(tag(event.title))
+
+    index = (history / history[0]).mean(axis=1)
+    drawdown = 1 - index / np.maximum.accumulate(index)
+    levels = np.searchsorted(DRAWDOWN_THRESHOLDS, drawdown, side="right")
+
+    deepest = 0
+    for day, level in enumerate(levels):
+        if drawdown[day] == 0:
+            deepest = 0
+        elif level > deepest:
+            shocks[day] += DRAWDOWN_SHOCK * (level - deepest)
+            deepest = level
+
+    shocks = np.clip(shocks, -1, 1) / len(LIFESTYLE_HOURS)
+    shocks.flags.writeable = False
+
+    return shocks
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import itertools
+import multiprocessing
+import time
+import typing as t
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+from qs.game import engine
+from qs.game.player import (
+    FOOD_TYPE,
+    HOUSING_QUALITY,
+    LOCATION_TYPE,
+    SALARIES,
+    BaseDecays,
+    Occupation,
+)
+from qs.game.session import SCENARIO_2008, Session
+from qs.game.strategies import STRATEGIES
+
+
+TABLES = {
+    "FOOD_TYPE": FOOD_TYPE,
+    "HOUSING_QUALITY": HOUSING_QUALITY,
+    "LOCATION_TYPE": LOCATION_TYPE,
+}
+
+
+def resolve_constant(name: str) -> tuple[t.Callable[[], float], t.Callable[[float], None]]:
+    """
+    Getter and setter of a game constant named like `BaseDecays.HEALTH`,
+    `FOOD_TYPE.ORGANIC.cost` or `SALARIES.software_engineer`.
+    """
+    head, _, rest = name.partition(".")
+
+    try:
+        if head == "BaseDecays":
+            decay = BaseDecays[rest]
+
+            def set_decay(value: float) -> None:
+                decay._value_ = value
+
+            return lambda: decay.value, set_decay
+
+        if head in TABLES:
+            member, _, key = rest.partition(".")
+            table = TABLES[head][member].value
+
+            if key not in table:
+                raise KeyError(key)
+
+            return lambda: table[key], lambda value: table.__setitem__(key, value)
+
+        if head == "SALARIES":
+            occupation = Occupation(rest)
+
+            return (
+                lambda: SALARIES[occupation],
+                lambda value: SALARIES.__setitem__(occupation, value),
+            )
+    except (KeyError, ValueError):
+        pass
+
+    raise ValueError(f"Unknown game constant '{name}'")
+
+
+@contextmanager
+def overridden(overrides: t.Mapping[str, float]) -> t.Iterator[None]:
+    """
+    Temporarily replace game constants for everything simulated in this
+    process.
+    """
+    constants = {name: resolve_constant(name) for name in overrides}
+    originals = {name: get() for name, (get, _) in constants.items()}
+
+    try:
+        for name, (_, setter) in constants.items():
+            setter(overrides[name])
+
+        engine.load_tables()
+        yield
+    finally:
+        for name, (_, setter) in constants.items():
+            setter(originals[name])
+
+        engine.load_tables()
+
+
+def sweep(grid: t.Mapping[str, t.Sequence[float]]) -> list[dict[str, float]]:
+    """
+    Every combination of the values in `grid`.
+    """
+    names = list(grid)
+
+    return [
+        dict(zip(names, values))
+        for values in itertools.product(*(grid[name] for name in names))
+    ]
+
+
+def run_game(
+    overrides: t.Mapping[str, float],
+    strategies: t.Sequence[str],
+    stock_prices: dict[str, dict[date, float]],
+    dividends: dict[str, dict[date, float]],
+    interval: timedelta = timedelta(days=7),
+) -> list[dict[str, t.Any]]:
+    """
+    Play one full scenario with one player per strategy and return a row
+    of summary metrics for each of them.
+    """
+    started = time.perf_counter()
+
+    with overridden(overrides):
+        session = Session(
+            session_id="simulation",
+            period=SCENARIO_2008,
+            stock_prices=stock_prices,
+            dividends=dividends,
+        )
+
+        players = [
+            (session.add_player(f"{index}-{name}"), STRATEGIES[name]())
+            for index, name in enumerate(strategies)
+        ]
+        lowest = [player.get_equity() for player, _ in players]
+
+        for player, strategy in players:
+            strategy.start(player)
+
+        _, end = SCENARIO_2008
+
+        while session.get_time() < end:
+            for index, (player, strategy) in enumerate(players):
+                strategy.act(player)
+                lowest[index] = min(lowest[index], player.get_equity())
+
+            session.advance_to(session.get_time() + interval)
+
+    elapsed = time.perf_counter() - started
+
+    return [
+        {
+            **overrides,
+            "strategy": strategy.name,
+            "balance": player.get_balance(),
+            "equity": player.get_equity(),
+            "lowest_equity": lowest[index],
+            "portfolio_value": player.get_stock_portfolio_value(),
+            "health": player.get_health_level(),
+            "happiness": player.get_happiness_level(),
+            "energy": player.get_energy_level(),
+            "social_life": player.get_social_life_level(),
+            "stress": player.get_stress_level(),
+            "living_comfort": player.get_living_comfort_level(),
+            "career_progress": player.get_career_progress_level(),
+            "skills_education": player.get_skills_education_level(),
+            "seconds": elapsed,
+        }
+        for index, (player, strategy) in enumerate(players)
+    ]
+
+
+def run_sweep(
+    grid: t.Mapping[str, t.Sequence[float]],
+    strategies: t.Sequence[str],
+    stock_prices: dict[str, dict[date, float]],
+    dividends: dict[str, dict[date, float]],
+    interval: timedelta = timedelta(days=7),
+    workers: int | None = None,
+) -> t.Iterator[dict[str, t.Any]]:
+    """
+    Run one game per point of the sweep across a process pool, yielding
+    result rows as games finish in sweep order.
+    """
+    context = multiprocessing.get_context("spawn")
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_load_market,
+        initargs=(stock_prices, dividends),
+    ) as pool:
+        games = [
+            pool.submit(_run_game, overrides, strategies, interval)
+            for overrides in sweep(grid)
+        ]
+
+        for game in games:
+            yield from game.result()
+
+
+# Worker side. The market is sent to every pool process once.
+
+_market: tuple[dict[str, dict[date, float]], dict[str, dict[date, float]]]
+
+
+def _load_market(
+    stock_prices: dict[str, dict[date, float]],
+    dividends: dict[str, dict[date, float]],
+) -> None:
+    global _market
+    _market = (stock_prices, dividends)
+
+
+def _run_game(
+    overrides: t.Mapping[str, float],
+    strategies: t.Sequence[str],
+    interval: timedelta,
+) -> list[dict[str, t.Any]]:
+    stock_prices, dividends = _market
+    return run_game(overrides, strategies, stock_prices, dividends, interval)
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import typing as t
+
+from qs.game.player import HOUSING_QUALITY, LOCATION_TYPE
+
+if t.TYPE_CHECKING:
+    from qs.game.player import Player
+
+
+class Strategy:
+    """
+    Scripted behaviour of one player in a headless simulation. `start` is
+    called once before the first hour is simulated, `act` at every step of
+    the simulation loop.
+    """
+    name: t.ClassVar[str]
+
+    def start(self, player: Player) -> None:
+        pass
+
+    def act(self, player: Player) -> None:
+        pass
+
+
+class Idle(Strategy):
+    """Keeps the default budgets and never trades."""
+    name = "idle"
+
+
+class BuyAndHold(Strategy):
+    """Invests most of the starting balance evenly and holds it."""
+    name = "buy_and_hold"
+    share = 0.8
+
+    def start(self, player: Player) -> None:
+        invest_evenly(player, player.get_balance() * self.share)
+
+
+class DollarCostAveraging(Strategy):
+    """Invests everything above a cash reserve evenly at every step."""
+    name = "dollar_cost_averaging"
+    reserve = 5000.0
+
+    def act(self, player: Player) -> None:
+        invest_evenly(player, player.get_balance() - self.reserve)
+
+
+class Frugal(Strategy):
+    """Eats cheaply, barely spends on leisure and lives small and rural."""
+    name = "frugal"
+
+    def start(self, player: Player) -> None:
+        player.set_monthly_food_budget(100)
+        player.set_monthly_leisure_expense(50)
+        player.move_accommodation(
+            accommodation_id="low_rural_30",
+            quality=HOUSING_QUALITY.LOW,
+            location=LOCATION_TYPE.RURAL,
+            sqm=30,
+        )
+
+
+class Lavish(Strategy):
+    """Eats organic, spends freely and lives large in the city center."""
+    name = "lavish"
+
+    def start(self, player: Player) -> None:
+        player.set_monthly_food_budget(300)
+        player.set_monthly_leisure_expense(800)
+        player.move_accommodation(
+            accommodation_id="high_city_center_100",
+            quality=HOUSING_QUALITY.HIGH,
+            location=LOCATION_TYPE.CITY_CENTER,
+            sqm=100,
+        )
+
+
+STRATEGIES: dict[str, type[Strategy]] = {
+    strategy.name: strategy
+    for strategy in (
+        Idle,
+        BuyAndHold,
+        DollarCostAveraging,
+        Frugal,
+        Lavish,
+    )
+}
+
+
+def invest_evenly(player: Player, amount: float) -> None:
+    """
+    Spend up to `amount` on whole shares, split evenly over all symbols.
+    """
+    session = player.get_session()
+    symbols = session.get_market().get_symbols()
+
+    if amount <= 0:
+        return
+
+    for symbol in symbols:
+        quantity = int(amount / len(symbols) // session.get_stock_price(symbol))
+
+        if quantity > 0:
+            player.buy_stock(symbol, quantity)
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import typing as t
+import zlib
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime, date
+
+from qs.game import journal
+from qs.game.calendar import Resolution
+from qs.game.journal import Journal
+
+if t.TYPE_CHECKING:
+    from qs.game.session import Session
+
+
+class WorkerPool:
+    """
+    Pool of simulation processes. Each session is pinned to one worker by
+    a stable hash of its id; every worker runs a single process, so the
+    batches of a session are applied in the order they were submitted.
+
+    Workers hold their own copy of each session and only ever receive
+    journal commands, which they apply and answer with a `Snapshot`.
+    """
+    def __init__(self, workers: int):
+        context = multiprocessing.get_context("spawn")
+
+        self._executors = tuple(
+            ProcessPoolExecutor(max_workers=1, mp_context=context)
+            for _ in range(workers)
+        )
+
+
+    @classmethod
+    def shared(cls, workers: int) -> WorkerPool:
+        global _shared
+
+        if _shared is None:
+            _shared = cls(workers)
+
+        return _shared
+
+
+    def __len__(self) -> int:
+        return len(self._executors)
+
+
+    def _executor(self, session_id: str) -> ProcessPoolExecutor:
+        index = zlib.crc32(session_id.encode()) % len(self._executors)
+        return self._executors[index]
+
+
+    def open(
+        self,
+        session_id: str,
+        period: tuple[datetime, datetime],
+        stock_prices: dict[str, dict[date, float]],
+        dividends: dict[str, dict[date, float]],
+        vectorized: bool,
+        interpolated_prices: bool,
+        resolution: Resolution,
+        seed: int,
+        log: Journal,
+    ) -> Future[None]:
+        return self._executor(session_id).submit(
+            _open,
+            session_id,
+            period,
+            stock_prices,
+            dividends,
+            vectorized,
+            interpolated_prices,
+            resolution,
+            seed,
+            log.encode(),
+        )
+
+
+    def apply(
+        self,
+        session_id: str,
+        commands: list[journal.Command],
+    ) -> asyncio.Future[journal.Snapshot]:
+        loop = asyncio.get_running_loop()
+        future = self._executor(session_id).submit(
+            _apply,
+            session_id,
+            journal.encode_commands(commands),
+        )
+
+        return asyncio.wrap_future(future, loop=loop)
+
+
+    def close(self, session_id: str) -> Future[None]:
+        return self._executor(session_id).submit(_close, session_id)
+
+
+    def shutdown(self) -> None:
+        for executor in self._executors:
+            executor.shutdown(cancel_futures=True)
+
+
+_shared: WorkerPool | None = None
+
+
+# Worker side. These run inside the pool processes and own their sessions.
+
+_sessions: dict[str, Session] = {}
+
+
+def _open(
+    session_id: str,
+    period: tuple[datetime, datetime],
+    stock_prices: dict[str, dict[date, float]],
+    dividends: dict[str, dict[date, float]],
+    vectorized: bool,
+    interpolated_prices: bool,
+    resolution: Resolution,
+    seed: int,
+    log: bytes,
+) -> None:
+    from qs.game.session import Session
+
+    session = Session(
+        session_id=session_id,
+        period=period,
+        stock_prices=stock_prices,
+        dividends=dividends,
+        vectorized=vectorized,
+        interpolated_prices=interpolated_prices,
+        resolution=resolution,
+        seed=seed,
+    )
+    session.replay(Journal.decode(log))
+
+    _sessions[session_id] = session
+
+
+def _apply(session_id: str, commands: bytes) -> journal.Snapshot:
+    session = _sessions[session_id]
+    session.apply(journal.decode_commands(commands))
+    return session.dump_state()
+
+
+def _close(session_id: str) -> None:
+    _sessions.pop(session_id, None)
@@ -1,5 +1,5 @@
 from datetime import datetime, timedelta
-from qs.events_data import EVENTS_DF
+from qs.events_data import EVENT_INDEX
 from qs.game.player import Player
 from qs.prompting import build_state_evaluation_prompt
 from qs.server.llm_client import call_llm, call_llm_chat
@@ -13,11 +13,10 @@ class Chatbot:
     def get_relevant_events(self, date: datetime) -> list[str]:
         # Retrieve events in the past 4 weeks from the given date
         four_weeks_ago = date - timedelta(weeks=4)
-        recent_events = EVENTS_DF[
-            (EVENTS_DF["Date"] >= four_weeks_ago.strftime("%Y-%m-%d"))
-            & (EVENTS_DF["Date"] <= date.strftime("%Y-%m-%d"))
-        ]["Event Title"].tolist()
-        return recent_events
+        return [
+            event.title
+            for event in EVENT_INDEX.between(four_weeks_ago.date(), date.date())
+        ]
 
     def evaluate_user_state(self, player: Player) -> str:
         player_state = player.dump_player_data()
@@ -1,3 +1,11 @@
+from __future__ import annotations
+
+import typing as t
+
+if t.TYPE_CHECKING:
+    from qs.events_data import EventResponse
+
+
 EVENT_EXPLANATION_SYSTEM_PROMPT = """
 You are a financial literacy tutor for teenagers.
 
@@ -32,11 +40,11 @@ Event:
 """
 
 
-def build_event_prompt(event: dict) -> str:
+def build_event_prompt(event: EventResponse) -> str:
     return EVENT_EXPLANATION_TEMPLATE.format(
-        date=event["date"],
-        title=event["title"],
-        description=event["description"],
+        date=event.date,
+        title=event.title,
+        description=event.description,
     )
 
 
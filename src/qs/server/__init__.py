@@ -7,3 +7,4 @@ factory = AppFactory(Settings, lambda settings: settings)
 
 get_settings = factory.create_settings_getter()
 get_session = factory.create_session_getter()
+get_store = factory.create_store_getter()
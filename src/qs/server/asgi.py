@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from qs.server import factory
+from qs.server.cli import SimulateCLIPlugin
 from qs.server.dependencies import get_dependencies
 from qs.server.routes import get_routes
 
@@ -10,4 +11,6 @@ factory.add_routes(routes)
 dependencies = get_dependencies()
 factory.add_dependencies(dependencies)
 
+factory.add_plugin(SimulateCLIPlugin())
+
 app = factory.create_app()
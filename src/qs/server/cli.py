@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import asyncio
+import typing as t
+from datetime import timedelta
+from pathlib import Path
+
+import click
+import pandas as pd
+from litestar.plugins import CLIPluginProtocol
+
+from qs.game.benchmarks import synthetic_market
+from qs.game.session import SCENARIO_2008, SCENARIO_2008_SYMBOLS
+from qs.game.simulate import resolve_constant, run_sweep, sweep
+from qs.game.stocks import get_stock_prices
+from qs.game.strategies import STRATEGIES
+
+if t.TYPE_CHECKING:
+    from click import Group
+
+
+class SimulateCLIPlugin(CLIPluginProtocol):
+    """
+    Adds the `simulate` command to the `qs` CLI.
+    """
+    def on_cli_init(self, cli: Group) -> None:
+        cli.add_command(simulate)
+
+
+def parse_sweeps(sweeps: t.Iterable[str]) -> dict[str, list[float]]:
+    grid: dict[str, list[float]] = {}
+
+    for item in sweeps:
+        name, _, values = item.partition("=")
+
+        try:
+            resolve_constant(name)
+            grid[name] = [float(value) for value in values.split(",")]
+        except ValueError as exc:
+            raise click.BadParameter(
+                f"'{item}': {exc}",
+                param_hint="--sweep",
+            )
+
+    return grid
+
+
+@click.command(
+    name="simulate",
+    help="Play headless games of the 2008 scenario across a process pool.",
+)
+@click.option(
+    "-s",
+    "--strategy",
+    "strategies",
+    multiple=True,
+    type=click.Choice(list(STRATEGIES)),
+    help="Strategy of one player in every game. Defaults to all of them.",
+)
+@click.option(
+    "--sweep",
+    "sweeps",
+    multiple=True,
+    metavar="CONSTANT=V1,V2,...",
+    help=(
+        "Game constant to sweep, e.g. BaseDecays.HEALTH=-0.5,-0.25 or "
+        "FOOD_TYPE.ORGANIC.cost=200,250. One game is played per combination."
+    ),
+)
+@click.option(
+    "--interval",
+    type=int,
+    default=7,
+    show_default=True,
+    help="Simulated days between strategy actions.",
+)
+@click.option(
+    "-w",
+    "--workers",
+    type=int,
+    default=None,
+    help="Worker processes. Defaults to the number of CPUs.",
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=Path("simulations.csv"),
+    show_default=True,
+    help="Summary metrics per game and strategy, as .csv or .parquet.",
+)
+@click.option(
+    "--synthetic",
+    is_flag=True,
+    help="Use a synthetic random walk market instead of downloading prices.",
+)
+def simulate(
+    strategies: tuple[str, ...],
+    sweeps: tuple[str, ...],
+    interval: int,
+    workers: int | None,
+    output: Path,
+    synthetic: bool,
+) -> None:
+    grid = parse_sweeps(sweeps)
+    strategies = strategies or tuple(STRATEGIES)
+
+    if synthetic:
+        stock_prices, dividends = synthetic_market()
+    else:
+        stock_prices, dividends = asyncio.run(
+            get_stock_prices(
+                symbols=SCENARIO_2008_SYMBOLS,
+                period=SCENARIO_2008,
+            )
+        )
+
+    games = len(sweep(grid))
+    click.echo(f"Playing {games} games with {len(strategies)} players each")
+
+    df = pd.DataFrame(
+        run_sweep(
+            grid=grid,
+            strategies=strategies,
+            stock_prices=stock_prices,
+            dividends=dividends,
+            interval=timedelta(days=interval),
+            workers=workers,
+        )
+    )
+
+    if output.suffix == ".parquet":
+        try:
+            df.to_parquet(output, index=False)
+        except ImportError as exc:
+            raise click.ClickException(f"Cannot write Parquet: {exc}")
+    else:
+        df.to_csv(output, index=False)
+
+    click.echo(f"Wrote {len(df)} rows to {output}")
@@ -1,13 +1,31 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+import weakref
+
 from litestar import Request
 from authlib.jose import jwt
 
 from qs.contrib.litestar import *
+from qs.contrib.msgspec import Struct, msgspec
 from qs.cache import lru_cache
-from qs.game.session import Session, Player
-from qs.server import get_settings
-from qs.exceptions import UnauthorizedError
+from qs.game.calendar import Resolution
+from qs.game.journal import Journal
+from qs.game.scheduler import Scheduler
+from qs.game.session import SCENARIO_2008, Session, Player
+from qs.game.workers import WorkerPool
+from qs.server import get_settings, get_store
+from qs.exceptions import ServiceUnavailableError, UnauthorizedError
+
+# store the encoded journal of every session is kept in, by session id
+SESSION_STORE = "sessions"
+
+# store the options of every created session are kept in, by session id
+SESSION_OPTIONS_STORE = "session_options"
+
+# seconds between two writes of the journal of a running session
+JOURNAL_WRITE_INTERVAL = 1.0
 
 
 def get_dependencies() -> dict[str, Provide]:
@@ -18,9 +36,141 @@ def get_dependencies() -> dict[str, Provide]:
     }
 
 
+class SessionOptions(Struct, frozen=True):
+    """
+    `Session.create_scenario_2008` options of a session, applied whenever
+    it is loaded.
+    """
+    resolution: Resolution = Resolution.HOURLY
+    interpolated_prices: bool = False
+    seed: int | None = None
+
+
+def get_session_ttl() -> int:
+    """
+    Seconds the stored journal and options of a session expire after: the
+    scenario played at normal speed, one hour per second, plus a grace
+    period. Each journal write extends both.
+    """
+    start, end = SCENARIO_2008
+    hours = int((end - start).total_seconds() // 3600)
+
+    return hours + get_settings().game.session_grace
+
+
+async def configure_session(session_id: str, options: SessionOptions) -> None:
+    """
+    Store the options of a session that has not been loaded yet.
+    """
+    try:
+        await get_store(SESSION_OPTIONS_STORE).set(
+            session_id,
+            msgspec.json.encode(options),
+            expires_in=get_session_ttl(),
+        )
+    except Exception:
+        logging.exception(f"Options of session '{session_id}' failed to save.")
+        raise ServiceUnavailableError()
+
+
+# sessions still referenced elsewhere, e.g. running on the scheduler after
+# being evicted from the `get_session` cache, which must not be rebuilt
+_loaded: weakref.WeakValueDictionary[str, Session] = \
+    weakref.WeakValueDictionary()
+
+# sessions whose journal is being written, and whether it changed meanwhile
+_writing: dict[str, bool] = {}
+
+
 @lru_cache(maxsize=1024, ttl=3600)
 async def get_session(session_id: str) -> Session:
-    return await Session.create_scenario_2008(session_id=session_id)
+    """
+    The loaded session, or the session rebuilt from its stored journal, or
+    a new session.
+    """
+    session = _loaded.get(session_id)
+    if session is not None:
+        return session
+
+    settings = get_settings().game
+    Scheduler.shared(budget=settings.tick_budget)
+
+    try:
+        options = await get_store(SESSION_OPTIONS_STORE).get(session_id)
+        data = await get_store(SESSION_STORE).get(session_id)
+    except Exception:
+        logging.exception(f"Journal of session '{session_id}' failed to load.")
+        raise ServiceUnavailableError()
+
+    if options is not None:
+        options = msgspec.json.decode(options, type=SessionOptions)
+
+    session = await Session.create_scenario_2008(
+        session_id=session_id,
+        **msgspec.structs.asdict(options or SessionOptions()),
+    )
+
+    if data is not None:
+        session.replay(Journal.decode(data))
+
+    # another request may have loaded it meanwhile
+    if (loaded := _loaded.get(session_id)) is not None:
+        return loaded
+
+    session.watch_journal(save_journal)
+
+    workers = settings.simulation_workers
+    if workers:
+        session.attach(WorkerPool.shared(workers))
+
+    session.resume()
+    _loaded[session_id] = session
+
+    return session
+
+
+def save_journal(session: Session) -> None:
+    """
+    Write the session's journal to the session store. At most one write
+    per session is in flight; changes made meanwhile are written by
+    another one `JOURNAL_WRITE_INTERVAL` seconds later.
+    """
+    session_id = session.get_id()
+
+    if session_id in _writing:
+        _writing[session_id] = True
+        return
+
+    _writing[session_id] = False
+    asyncio.get_running_loop().create_task(_write_journal(session))
+
+
+async def _write_journal(session: Session) -> None:
+    session_id = session.get_id()
+
+    try:
+        while True:
+            ttl = get_session_ttl()
+
+            await get_store(SESSION_STORE).set(
+                session_id,
+                session.get_journal().encode(),
+                expires_in=ttl,
+            )
+            await get_store(SESSION_OPTIONS_STORE).get(
+                session_id,
+                renew_for=ttl,
+            )
+
+            if not _writing[session_id]:
+                break
+
+            _writing[session_id] = False
+            await asyncio.sleep(JOURNAL_WRITE_INTERVAL)
+    except Exception:
+        logging.exception(f"Journal of session '{session_id}' failed to save.")
+    finally:
+        del _writing[session_id]
 
 
 async def provide_session(session_id: str) -> Session:
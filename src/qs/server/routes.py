@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import asyncio
 import typing as t
 import secrets
+from datetime import timezone
 
+import numpy as np
 from authlib.jose import jwt
 
+from qs.cache import CacheInfo, get_all_cache_info
 from qs.contrib.litestar import *
 from qs.events_data import get_event_by_id
 from qs.nlp.chatbot import Chatbot
@@ -20,9 +24,19 @@ from qs.server.exceptions import *
 from qs.server.llm_client import call_llm
 from qs.server.schemas import *
 from qs.server.services import *
+from qs.game import journal
+from qs.game.backtest import backtest
+from qs.game.projection import PERCENTILES, prepare_projection
 from qs.game.session import Session
 from qs.game.player import Player, HOUSING_QUALITY, LOCATION_TYPE
-from qs.server.dependencies import get_session
+from qs.server.dependencies import (
+    SessionOptions,
+    configure_session,
+    get_session,
+)
+
+
+MAX_PROJECTION_PATHS = 5000
 
 
 def get_routes() -> list[ControllerRouterHandler]:
@@ -52,8 +66,17 @@ def create_token(session_id: str, username: str) -> str:
     return token.decode("utf-8")
 
 
-async def create_session() -> Session:
+async def create_session(data: SessionCreateRequest) -> Session:
     session_id = secrets.token_hex(3).upper()
+    await configure_session(
+        session_id,
+        SessionOptions(
+            resolution=data.resolution,
+            interpolated_prices=data.interpolated_prices,
+            seed=data.seed,
+        ),
+    )
+
     return await get_session(session_id)
 
 
@@ -70,7 +93,7 @@ class SessionController(Controller):
         self,
         data: SessionCreateRequest,
     ) -> SessionCreateResponse:
-        session = await create_session()
+        session = await create_session(data)
 
         session.add_player(data.username, is_leader=True)
 
@@ -170,14 +193,7 @@ class GameController(Controller):
             for symbol in session.get_stock_prices().keys()
         ]
 
-        events = [
-            EventResponse(
-                id=event["id"],
-                date=event["date"],
-                title=event["title"],
-                description=event["description"],
-            ) for event in player.get_events()
-        ]
+        events = list(player.get_events())
 
         players = [
             PlayerStats(
@@ -193,6 +209,8 @@ class GameController(Controller):
             is_leader=player.is_leader(),
             time=session.get_time(),
             time_progression_multiplier=session.get_time_progression_multiplier(),
+            effective_time_progression_multiplier=session.get_effective_speed(),
+            lag=session.get_lag(),
             balance=player.get_balance(),
             assets=player.get_assets(),
             equity=player.get_equity(),
@@ -218,6 +236,7 @@ class GameController(Controller):
             monthly_loan_expense=player.get_monthly_loan_expense(),
             monthly_tax_expense=player.get_monthly_tax_expense(),
             stocks=stocks,
+            orders=player.get_orders(),
             events=events,
             players=players,
         )
@@ -234,6 +253,112 @@ class GameController(Controller):
         session = leader.get_session()
         session.set_time_progression_multiplier(data)
 
+    @post(
+        operation_id="AdvanceSession",
+        path="/advance",
+    )
+    async def advance(
+        self,
+        leader: Player,
+        data: AdvanceRequest,
+    ) -> None:
+        """Fast-forward the session to the given simulated time."""
+        session = leader.get_session()
+        time = data.time
+
+        # the simulated clock is naive UTC
+        if time.tzinfo is not None:
+            time = time.astimezone(timezone.utc).replace(tzinfo=None)
+
+        if time <= session.get_time():
+            raise BadRequestError("Sessions can only be advanced forward")
+
+        session.advance_to(time)
+
+    @get(
+        operation_id="GetCacheInfo",
+        path="/cache-info",
+    )
+    async def get_cache_info(
+        self,
+        leader: Player,
+    ) -> dict[str, CacheInfo]:
+        """Hit counts of the session's player caches and the process caches."""
+        session = leader.get_session()
+
+        return {
+            "players": session.cache_info(),
+            **get_all_cache_info(),
+        }
+
+    @get(
+        operation_id="GetProjection",
+        path="/projection",
+    )
+    async def get_projection(
+        self,
+        player: Player,
+        paths: int = 500,
+        seed: int | None = None,
+    ) -> ProjectionResponse:
+        """
+        Equity and lifestyle through the end of the scenario if the player
+        keeps their current budgets, accommodation and holdings.
+        """
+        if not 1 <= paths <= MAX_PROJECTION_PATHS:
+            raise BadRequestError(
+                f"paths must be between 1 and {MAX_PROJECTION_PATHS}",
+            )
+
+        # the row is copied here, the run takes long enough to block the
+        # event loop and the scheduler
+        run = prepare_projection(player, paths=paths, seed=seed)
+        projection = await asyncio.get_running_loop().run_in_executor(None, run)
+
+        return ProjectionResponse(
+            times=projection.times,
+            balance=projection.balance.tolist(),
+            historical_equity=projection.historical_equity.tolist(),
+            equity_bands=[
+                EquityBand(percentile=percentile, equity=equity.tolist())
+                for percentile, equity in zip(
+                    PERCENTILES,
+                    projection.equity_bands,
+                )
+            ],
+            lifestyle={
+                name: np.rint(levels).astype(int).tolist()
+                for name, levels in projection.lifestyle.items()
+            },
+        )
+
+    @post(
+        operation_id="Backtest",
+        path="/backtest",
+    )
+    async def backtest(
+        self,
+        player: Player,
+        data: BacktestRequest,
+    ) -> BacktestResponse:
+        """
+        Equity curve of dated orders and/or a rebalancing rule over the
+        scenario's price history. Identical requests are computed once.
+        """
+        session = player.get_session()
+        result = backtest(session.get_scenario(), data)
+
+        return BacktestResponse(
+            days=result.days,
+            equity=result.equity.tolist(),
+            drawdown=result.drawdown.tolist(),
+            cash=result.cash.tolist(),
+            dividends=result.dividends.tolist(),
+            max_drawdown=float(result.drawdown.min()),
+            total_dividends=float(result.dividends[-1]),
+            holdings=result.holdings,
+        )
+
     @post(
         operation_id="SetMonthlyGroceryExpense",
         path="/set-monthly-grocery-expense",
@@ -243,7 +368,9 @@ class GameController(Controller):
         player: Player,
         data: float,
     ) -> None:
-        player.set_monthly_food_budget(data)
+        await player.get_session().submit(
+            journal.SetFoodBudget(player.get_username(), data),
+        )
 
     @post(
         operation_id="SetMonthlyLeisureExpense",
@@ -254,7 +381,9 @@ class GameController(Controller):
         player: Player,
         data: float,
     ) -> None:
-        player.set_monthly_leisure_expense(data)
+        await player.get_session().submit(
+            journal.SetLeisureBudget(player.get_username(), data),
+        )
 
     @get(
         operation_id="GetStockPrices",
@@ -278,6 +407,17 @@ class GameController(Controller):
         session = player.get_session()
         return session.get_dividends()
 
+    @get(
+        operation_id="GetLedger",
+        path="/ledger",
+    )
+    async def get_ledger(
+        self,
+        player: Player,
+    ) -> dict[str, float]:
+        """Running totals of the player's balance postings by line item."""
+        return player.get_ledger()
+
     @post(
         operation_id="BuyStock",
         path="/stock/{symbol:str}/buy",
@@ -288,7 +428,9 @@ class GameController(Controller):
         symbol: str,
         data: int,
     ) -> None:
-        player.buy_stock(symbol, data)
+        await player.get_session().submit(
+            journal.BuyStock(player.get_username(), symbol, data),
+        )
 
     @post(
         operation_id="SellStock",
@@ -300,7 +442,9 @@ class GameController(Controller):
         symbol: str,
         data: int,
     ) -> None:
-        player.sell_stock(symbol, data)
+        await player.get_session().submit(
+            journal.SellStock(player.get_username(), symbol, data),
+        )
 
     @post(
         operation_id="LiquidateStock",
@@ -311,7 +455,66 @@ class GameController(Controller):
         player: Player,
         symbol: str,
     ) -> None:
-        player.liquidate_stock(symbol)
+        await player.get_session().submit(
+            journal.LiquidateStock(player.get_username(), symbol),
+        )
+
+    @get(
+        operation_id="GetOrders",
+        path="/orders",
+    )
+    async def get_orders(
+        self,
+        player: Player,
+    ) -> list[RestingOrder]:
+        return player.get_orders()
+
+    @post(
+        operation_id="PlaceOrder",
+        path="/orders",
+    )
+    async def place_order(
+        self,
+        player: Player,
+        data: PlaceOrderRequest,
+    ) -> RestingOrder:
+        """Rest a limit, stop-loss or take-profit order until the price reaches it."""
+        session = player.get_session()
+
+        if data.symbol not in session.get_market().get_symbols():
+            raise BadRequestError(f"Unknown symbol '{data.symbol}'")
+
+        price = session.get_stock_price(data.symbol)
+
+        if data.kind == OrderKind.TAKE_PROFIT and data.price <= price:
+            raise BadRequestError("Take-profit orders must be above the price")
+        if data.kind != OrderKind.TAKE_PROFIT and data.price >= price:
+            raise BadRequestError(
+                "Limit and stop-loss orders must be below the price",
+            )
+
+        return await session.submit(
+            journal.PlaceOrder(
+                username=player.get_username(),
+                symbol=data.symbol,
+                kind=data.kind,
+                price=data.price,
+                quantity=data.quantity,
+            )
+        )
+
+    @delete(
+        operation_id="CancelOrder",
+        path="/orders/{order_id:int}",
+    )
+    async def cancel_order(
+        self,
+        player: Player,
+        order_id: int,
+    ) -> None:
+        await player.get_session().submit(
+            journal.CancelOrder(player.get_username(), order_id),
+        )
 
     @get(
         operation_id="PlayerStateEvaluation",
@@ -449,11 +652,14 @@ class LifestyleController(Controller):
                 "Invalid quality or location in accommodation ID")
 
         # Move to new accommodation
-        player.move_accommodation(
-            accommodation_id=data.accommodation_id,
-            quality=quality,
-            location=location,
-            sqm=sqm,
+        await player.get_session().submit(
+            journal.MoveAccommodation(
+                username=player.get_username(),
+                accommodation_id=data.accommodation_id,
+                quality=quality.name,
+                location=location.name,
+                sqm=sqm,
+            )
         )
 
 
@@ -1,11 +1,19 @@
 from __future__ import annotations
 
 from qs.contrib.msgspec import *
+from qs.events_data import EventResponse
+from qs.game.backtest import Order, Rebalance
+from qs.game.backtest import Strategy as BacktestRequest
+from qs.game.calendar import Resolution
+from qs.game.orders import OrderKind, RestingOrder
 from qs.game.session import SessionStatus
 
 
 class SessionCreateRequest(Struct):
     username: str
+    resolution: Resolution = Resolution.HOURLY
+    interpolated_prices: bool = False
+    seed: int | None = None
 
 
 class SessionCreateResponse(Struct):
@@ -21,13 +29,6 @@ class SessionJoinResponse(Struct):
     token: str
 
 
-class EventResponse(Struct):
-    id: int
-    date: str
-    title: str
-    description: str
-
-
 class PlayerStats(Struct):
     username: str
     balance: float
@@ -40,6 +41,8 @@ class PollResponse(Struct):
     is_leader: bool
     time: datetime
     time_progression_multiplier: int
+    effective_time_progression_multiplier: float
+    lag: float
 
     balance: float
     assets: float
@@ -66,6 +69,7 @@ class PollResponse(Struct):
     monthly_loan_expense: float
     monthly_tax_expense: float
     stocks: list[Position]
+    orders: list[RestingOrder]
     events: list[EventResponse]
     players: list[PlayerStats]
 
@@ -78,6 +82,17 @@ class Position(Struct):
     pnl: float
 
 
+class PlaceOrderRequest(Struct):
+    symbol: str
+    kind: OrderKind
+    price: float
+    quantity: int
+
+
+class AdvanceRequest(Struct):
+    time: datetime
+
+
 class TextExplanationRequest(Struct):
     text: str
     context: str
@@ -115,3 +130,32 @@ class ListAccommodationsResponse(Struct):
 
 class MoveAccommodationRequest(Struct):
     accommodation_id: str
+
+
+class EquityBand(Struct):
+    percentile: int
+    equity: list[float]
+
+
+class ProjectionResponse(Struct):
+    """
+    Monthly projection of a player to the end of the scenario. Balance and
+    lifestyle follow the historical prices only; the equity bands spread
+    over bootstrapped price paths, which do not feed back into stress.
+    """
+    times: list[datetime]
+    balance: list[float]
+    historical_equity: list[float]
+    equity_bands: list[EquityBand]
+    lifestyle: dict[str, list[int]]
+
+
+class BacktestResponse(Struct):
+    days: list[date]
+    equity: list[float]
+    drawdown: list[float]
+    cash: list[float]
+    dividends: list[float]
+    max_drawdown: float
+    total_dividends: float
+    holdings: dict[str, int]
@@ -1,12 +1,37 @@
 from __future__ import annotations
 
+import os
+
 import msgspec
+from msgspec import Struct
 
 from qs.contrib.litestar import AppSettings
 from qs.contrib.openai.settings import OpenAISettings
 
 
+class GameSettings(Struct):
+    simulation_workers: int = int(os.environ.get("QS_SIMULATION_WORKERS", "0"))
+    """
+    Number of worker processes sessions are simulated in. With 0, sessions
+    are advanced on the event loop serving requests.
+    """
+    tick_budget: float = float(os.environ.get("QS_TICK_BUDGET", "0.5"))
+    """
+    CPU seconds per second the scheduler may spend advancing sessions
+    before the effective speed of running sessions is scaled back.
+    """
+    session_grace: int = int(os.environ.get("QS_SESSION_GRACE", str(7 * 86400)))
+    """
+    Seconds the journal and options of a session are kept beyond the time
+    its scenario takes to play at normal speed, counted from their last
+    write.
+    """
+
+
 class Settings(AppSettings):
     openai: OpenAISettings = msgspec.field(
         default_factory=OpenAISettings,
     )
+    game: GameSettings = msgspec.field(
+        default_factory=GameSettings,
+    )
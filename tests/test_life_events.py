@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from datetime import date
+
+from qs.game import benchmarks, life_events
+from qs.game.calendar import Resolution
+from qs.game.ledger import LineItem
+from qs.game.life_events import LifeEvent
+
+
+def play(seed: int, players: int, events: bool):
+    session = benchmarks.synthetic_session(
+        players=players,
+        resolution=Resolution.MONTHLY,
+        seed=seed,
+    )
+    engine = session.get_engine()
+
+    if not events:
+        # point every row at the end of the empty schedule
+        engine.life_event_cursor[:players] = 0
+
+    _, end = session.get_period()
+    session.advance_to(end)
+
+    return engine.ledger[:players]
+
+
+def test_life_events_cost_players_on_average():
+    changes = []
+
+    for seed in range(10):
+        ledger = play(seed, players=50, events=True)
+        baseline = play(seed, players=50, events=False)
+
+        # a layoff stops the salary until the rehire
+        assert (ledger[:, LineItem.SALARY] <= baseline[:, LineItem.SALARY]).all()
+
+        changes.extend(
+            ledger[:, LineItem.SALARY] +
+            ledger[:, LineItem.LIFE_EVENTS] -
+            baseline[:, LineItem.SALARY]
+        )
+
+    assert any(change < -5000 for change in changes)
+    assert sum(changes) / len(changes) < 0
+
+
+def test_every_job_loss_is_followed_by_a_rehire():
+    for seed in range(100):
+        _, events, _ = life_events.sample(
+            life_events.rng_for(seed, "player"),
+            start=date(2008, 1, 1),
+            end=date(2048, 1, 1),
+            salary=5000.0,
+        )
+        employment = events[
+            (events == LifeEvent.JOB_LOSS) | (events == LifeEvent.REHIRE)
+        ]
+
+        assert len(employment) > 0
+        assert (employment[0::2] == LifeEvent.JOB_LOSS).all()
+        assert (employment[1::2] == LifeEvent.REHIRE).all()
+        assert len(employment) % 2 == 0
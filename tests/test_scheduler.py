@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import asyncio
+
+from qs.game import scheduler as scheduler_module
+from qs.game.scheduler import Scheduler
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def perf_counter(self) -> float:
+        return self.now
+
+
+class StalledSession:
+    def get_id(self) -> str:
+        return "STALLED"
+
+    def get_time_progression_multiplier(self) -> int:
+        return 1
+
+    def drain(self) -> None:
+        pass
+
+    def run_seconds(self, seconds: float) -> bool:
+        return True
+
+
+def test_lag_is_cleared_once_the_backlog_is_caught_up(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(scheduler_module, "time", clock)
+    monkeypatch.setattr(Scheduler, "_ensure_running", lambda self: None)
+
+    scheduler = Scheduler(slots=1, catch_up=2.0, max_backlog=10.0)
+    session = StalledSession()
+    scheduler.add(session)
+
+    async def run():
+        # a long stall drops everything beyond the maximum backlog
+        clock.now = 30.0
+        await scheduler._turn()
+        assert scheduler.get_lag(session) == 20.0 + 8.0
+
+        # turns a second apart run two seconds each until caught up
+        for _ in range(7):
+            clock.now += 1.0
+            await scheduler._turn()
+            assert scheduler.get_lag(session) > 0
+
+        clock.now += 1.0
+        await scheduler._turn()
+        assert scheduler.get_lag(session) == 0.0
+
+        clock.now += 1.0
+        await scheduler._turn()
+        assert scheduler.get_lag(session) == 0.0
+
+    asyncio.run(run())
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+
+from qs.game import benchmarks, journal
+from qs.game.calendar import Resolution
+from qs.game.session import SessionStatus
+
+
+def test_waiting_sessions_end_with_their_period():
+    for resolution in Resolution:
+        for move in ("advance", "advance_to"):
+            session = benchmarks.synthetic_session(
+                players=1,
+                resolution=resolution,
+            )
+            _, end = session.get_period()
+            assert session.get_status() == SessionStatus.WAITING
+
+            if move == "advance":
+                hours = (end - session.get_time()) // timedelta(hours=1)
+                session.advance(hours + 24)
+            else:
+                session.advance_to(end + timedelta(days=1))
+
+            assert session.get_time() == end
+            assert session.get_status() == SessionStatus.ENDED
+            assert isinstance(
+                session.get_journal().get_entries()[-1],
+                journal.Stop,
+            )
+
+
+def test_stop_leaves_waiting_sessions_waiting():
+    session = benchmarks.synthetic_session(players=1)
+    session.stop()
+
+    assert session.get_status() == SessionStatus.WAITING
+
+
+def test_coarse_resolutions_require_the_vectorized_engine():
+    for resolution in (Resolution.DAILY, Resolution.MONTHLY):
+        with pytest.raises(ValueError):
+            benchmarks.synthetic_session(
+                resolution=resolution,
+                vectorized=False,
+            )
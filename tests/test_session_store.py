@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import asyncio
+import gc
+from datetime import timedelta
+
+from litestar.stores.registry import StoreRegistry
+
+from qs.game import benchmarks
+from qs.game.calendar import Resolution
+from qs.game import session as session_module
+from qs.server import dependencies
+
+
+def test_evicted_session_is_rebuilt_from_its_journal(monkeypatch):
+    stores = StoreRegistry()
+
+    async def get_stock_prices(symbols, period):
+        return benchmarks.synthetic_market(symbols, period)
+
+    monkeypatch.setattr(dependencies, "get_store", stores.get)
+    monkeypatch.setattr(dependencies, "JOURNAL_WRITE_INTERVAL", 0)
+    monkeypatch.setattr(session_module, "get_stock_prices", get_stock_prices)
+
+    async def run():
+        await dependencies.configure_session(
+            "REBUILT",
+            dependencies.SessionOptions(resolution=Resolution.DAILY, seed=7),
+        )
+        session = await dependencies.get_session("REBUILT")
+        player = session.add_player("alice", is_leader=True)
+        symbol = session.get_market().get_symbols()[0]
+
+        player.buy_stock(symbol, 10)
+        session.advance_to(session.get_time() + timedelta(days=45))
+        player.set_monthly_food_budget(120.0)
+        session.advance_to(session.get_time() + timedelta(days=10))
+
+        expected = (
+            session.get_resolution(),
+            session.get_seed(),
+            session.get_time(),
+            [player.dump_player_data() for player in session.get_players()],
+            session.get_engine().dump_columns(),
+        )
+
+        while dependencies._writing:
+            await asyncio.sleep(0.01)
+
+        for name in (
+            dependencies.SESSION_STORE,
+            dependencies.SESSION_OPTIONS_STORE,
+        ):
+            expires_in = await stores.get(name).expires_in("REBUILT")
+            assert 0 < expires_in <= dependencies.get_session_ttl()
+
+        dependencies.get_session.cache_clear()
+        del session, player
+        gc.collect()
+        assert "REBUILT" not in dependencies._loaded
+
+        rebuilt = await dependencies.get_session("REBUILT")
+
+        assert (
+            rebuilt.get_resolution(),
+            rebuilt.get_seed(),
+            rebuilt.get_time(),
+            [player.dump_player_data() for player in rebuilt.get_players()],
+            rebuilt.get_engine().dump_columns(),
+        ) == expected
+
+    asyncio.run(run())
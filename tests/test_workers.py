@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+
+from qs.game import benchmarks, journal
+from qs.game.orders import OrderKind
+from qs.game.session import SessionStatus
+from qs.game.workers import WorkerPool
+
+
+async def synced(session, timeout: float = 60.0) -> None:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+
+    while session._in_flight is not None or session._outbox:
+        assert loop.time() < deadline
+        await asyncio.sleep(0.05)
+
+
+def test_commands_raced_by_a_worker_fill_are_skipped():
+    session = benchmarks.synthetic_session(players=1)
+    player = session.get_players()[0]
+    symbol = session.get_market().get_symbols()[0]
+    price = session.get_stock_price(symbol)
+
+    player.buy_stock(symbol, 10)
+    player.place_order(symbol, OrderKind.TAKE_PROFIT, price / 2, 5)
+    order = player.place_order(symbol, OrderKind.TAKE_PROFIT, price / 2, 5)
+
+    async def run():
+        pool = WorkerPool(1)
+
+        try:
+            session.attach(pool)
+            session.advance(24 * 60)
+
+            # the worker fills both orders while these apply locally
+            player.sell_stock(symbol, 10)
+            player.cancel_order(order.id)
+
+            await synced(session)
+            start = session.get_time()
+            session.advance(24)
+            await synced(session)
+        finally:
+            pool.shutdown()
+
+        # still simulated in the worker, not stopped after a failed batch
+        assert session._workers is not None
+        assert session.get_status() != SessionStatus.ENDED
+        assert session.get_time() == start + timedelta(hours=24)
+        assert player.get_position_size(symbol) == 0
+        assert player.get_orders() == []
+        assert not any(
+            isinstance(command, (journal.SellStock, journal.CancelOrder))
+            for command in session.get_journal().get_entries()
+        )
+
+    asyncio.run(run())